@@ -0,0 +1,79 @@
+"""Startup-time benchmark for the GUI and batch entry points.
+
+Each scenario runs in a fresh interpreter and is timed from process spawn
+until the child reports it is ready:
+
+- ``gui_import``: ``import employee_app.app``
+- ``gui_first_window``: main window constructed, shown and painted once
+- ``batch_first_row``: first generated chunk available to the CLI path
+
+Usage::
+
+    python benchmarks/startup.py [--repeat 5] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "gui_import": "import employee_app.app",
+    "gui_first_window": (
+        "from PySide6.QtWidgets import QApplication\n"
+        "from employee_app.app import EmployeeApp\n"
+        "app = QApplication([])\n"
+        "window = EmployeeApp()\n"
+        "window.show()\n"
+        "app.processEvents()\n"
+    ),
+    "batch_first_row": (
+        "from employee_app.generator import iter_employee_chunks\n"
+        "next(iter_employee_chunks(1))\n"
+    ),
+}
+
+
+def time_scenario(code: str) -> float:
+    """Seconds from spawning a fresh interpreter until ``code`` has run."""
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    script = code + "\nprint('ready', flush=True)\n"
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", script], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    line = proc.stdout.readline()
+    elapsed = time.perf_counter() - started
+    proc.wait()
+    if line.strip() != "ready":
+        raise RuntimeError(f"scenario failed with exit code {proc.returncode}")
+    return elapsed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per scenario (default: 5)")
+    parser.add_argument("--json", dest="json_path", help="also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, code in SCENARIOS.items():
+        try:
+            runs = [time_scenario(code) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{name:<18} skipped ({e})")
+            continue
+        results[name] = {"median_s": statistics.median(runs), "min_s": min(runs), "runs": runs}
+        print(f"{name:<18} median {results[name]['median_s'] * 1000:8.1f} ms   min {min(runs) * 1000:8.1f} ms")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
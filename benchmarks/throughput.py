@@ -0,0 +1,162 @@
+"""Throughput benchmark for the generator and exporter.
+
+Every case runs in a fresh interpreter so peak RSS is measured per case:
+
+- ``generate``: each generation mode (rows, vectorized, chunked, parallel)
+- ``export``: each registered export format, from a pre-generated frame
+
+Results (rows/s, peak RSS, output size) are printed and can be written as
+JSON. Against a stored baseline, any case whose rows/s dropped by more than
+``--threshold`` is reported as a regression and the exit code is 1.
+
+Usage::
+
+    python benchmarks/throughput.py [--sizes 1000 100000 1000000] [--json results.json]
+    python benchmarks/throughput.py --update-baseline      # store current numbers
+    python benchmarks/throughput.py --threshold 0.15       # compare to the baseline
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from employee_app.metrics import format_bytes, peak_rss_bytes  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+GENERATION_MODES = ["rows", "vectorized", "chunked", "parallel"]
+ROWS_MODE_MAX = 100_000  # the per-row Faker mode is skipped above this size
+SEED = 12345
+
+
+def generate(mode: str, n: int):
+    from employee_app.generator import generate_employee_data, generate_employee_data_parallel, iter_employee_chunks
+
+    if mode == "rows":
+        return generate_employee_data(n, seed=SEED)
+    if mode == "vectorized":
+        return generate_employee_data(n, vectorized=True, seed=SEED)
+    if mode == "chunked":
+        for _ in iter_employee_chunks(n, seed=SEED):
+            pass
+        return None
+    if mode == "parallel":
+        return generate_employee_data_parallel(n, seed=SEED)
+    raise ValueError(f"Unknown generation mode: {mode!r}")
+
+
+def run_case(kind: str, name: str, n: int) -> dict:
+    """Run one case in this process and return its measurements."""
+    # Pay the one-off lazy import and Faker setup cost outside the timed region
+    import pandas  # noqa: F401
+    from employee_app.generator import LOCALE
+    from employee_app.names import get_name_pool
+    get_name_pool(LOCALE)
+
+    output_bytes = None
+    if kind == "generate":
+        started = time.perf_counter()
+        generate(name, n)
+        elapsed = time.perf_counter() - started
+    else:
+        from employee_app.exporter import export_data
+        data = generate("vectorized", n)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            started = time.perf_counter()
+            file_path = export_data(data, tmpdir, name)
+            elapsed = time.perf_counter() - started
+            output_bytes = sum(f.stat().st_size for f in file_path.parent.iterdir())
+
+    return {
+        "kind": kind, "name": name, "rows": n, "seconds": elapsed,
+        "rows_per_s": n / elapsed if elapsed else None,
+        "peak_rss_bytes": peak_rss_bytes(), "output_bytes": output_bytes,
+    }
+
+
+def run_case_subprocess(kind: str, name: str, n: int) -> dict:
+    proc = subprocess.run([sys.executable, __file__, "--case", kind, name, str(n)],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else f"exit code {proc.returncode}")
+    return json.loads(proc.stdout)
+
+
+def case_key(result: dict) -> str:
+    return f"{result['kind']}/{result['name']}/{result['rows']}"
+
+
+def compare_to_baseline(results: list, baseline: dict, threshold: float) -> list:
+    """Return (key, baseline rows/s, current rows/s) for cases slower than ``threshold``."""
+    regressions = []
+    for result in results:
+        previous = baseline.get(case_key(result))
+        if not previous or not previous.get("rows_per_s") or not result["rows_per_s"]:
+            continue
+        if result["rows_per_s"] < previous["rows_per_s"] * (1 - threshold):
+            regressions.append((case_key(result), previous["rows_per_s"], result["rows_per_s"]))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="row counts to benchmark")
+    parser.add_argument("--modes", nargs="+", default=GENERATION_MODES, help="generation modes to benchmark")
+    parser.add_argument("--formats", nargs="+", default=None, help="export formats to benchmark (default: all)")
+    parser.add_argument("--json", dest="json_path", help="write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed rows/s drop before flagging a regression (default: 0.2 = 20%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--case", nargs=3, metavar=("KIND", "NAME", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        kind, name, n = args.case
+        print(json.dumps(run_case(kind, name, int(n))))
+        return 0
+
+    from employee_app.exporter import EXPORT_FORMATS
+    formats = args.formats or list(EXPORT_FORMATS)
+    cases = [("generate", mode, n) for n in args.sizes for mode in args.modes
+             if not (mode == "rows" and n > ROWS_MODE_MAX)]
+    cases += [("export", fmt, n) for n in args.sizes for fmt in formats]
+
+    results = []
+    print(f"{'case':<32} {'rows/s':>14} {'peak RSS':>12} {'output':>12}")
+    for kind, name, n in cases:
+        try:
+            result = run_case_subprocess(kind, name, n)
+        except RuntimeError as e:
+            print(f"{kind}/{name}/{n:<20} failed: {e}")
+            continue
+        results.append(result)
+        print(f"{case_key(result):<32} {result['rows_per_s']:>14,.0f} "
+              f"{format_bytes(result['peak_rss_bytes']):>12} {format_bytes(result['output_bytes']):>12}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update({case_key(result): result for result in results})
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True))
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        return 0
+    regressions = compare_to_baseline(results, json.loads(args.baseline.read_text()), args.threshold)
+    for key, before, after in regressions:
+        print(f"REGRESSION {key}: {before:,.0f} -> {after:,.0f} rows/s ({after / before - 1:+.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
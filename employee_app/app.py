@@ -1,23 +1,33 @@
+import shutil
 import sys
-import pandas as pd
+import tempfile
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
     QLabel, QFileDialog, QMessageBox, QFrame, QSpacerItem, QSizePolicy,
-    QGroupBox, QProgressBar
+    QGroupBox, QProgressBar, QComboBox, QTableView, QHeaderView
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThreadPool, QTimer
 from PySide6.QtGui import QFont, QPalette, QIcon
-from .generator import generate_employee_data
-from .exporter import export_to_excel
+from .cache import DatasetCache
+from .exporter import EXPORT_FORMATS
+from .jobs import Job, export_job, generate_job
+from .preview import FrameTableModel
+
+MAX_EMPLOYEES = 5_000_000
 
 class EmployeeApp(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("🏢 Employee Data Generator - Professional Edition")
         self.setMinimumSize(600, 650)
-        self.resize(700, 750)
+        self.resize(750, 900)
         self.folder_path = ""
-        self.data = pd.DataFrame()
+        self.data = None  # generated DataFrame; pandas loads with the first job
+        # Generated datasets are spooled to memory-mapped snapshots here, removed on close
+        self.spool_dir = tempfile.mkdtemp(prefix="employee_app-")
+        self.job = None
+        self.cache = DatasetCache()
+        self.schema = None  # None = the built-in employee schema
         self.setup_styling()
         self.init_ui()
 
@@ -69,6 +79,19 @@ class EmployeeApp(QWidget):
                 border-color: #bdc3c7;
             }
             
+            QComboBox {
+                border: 2px solid #e1e8ed;
+                border-radius: 8px;
+                padding: 12px 15px;
+                font-size: 14px;
+                background-color: #ffffff;
+                color: #2c3e50;
+            }
+            
+            QComboBox:hover {
+                border-color: #bdc3c7;
+            }
+            
             QPushButton {
                 background-color: #3498db;
                 color: white;
@@ -245,7 +268,7 @@ class EmployeeApp(QWidget):
         main_layout.addWidget(title_label)
 
         # Subtitle
-        subtitle_label = QLabel("Generate realistic employee data and export to Excel")
+        subtitle_label = QLabel("Generate realistic employee data and export to Excel, Parquet, CSV and more")
         subtitle_label.setObjectName("infoLabel")
         subtitle_label.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(subtitle_label)
@@ -269,6 +292,28 @@ class EmployeeApp(QWidget):
         self.num_input.setPlaceholderText("e.g., 50")
         self.num_input.textChanged.connect(self.validate_input)
         step1_layout.addWidget(self.num_input)
+
+        seed_info = QLabel("Optional seed — the same seed always gives the same data (and is cached):")
+        seed_info.setObjectName("infoLabel")
+        step1_layout.addWidget(seed_info)
+
+        self.seed_input = QLineEdit()
+        self.seed_input.setPlaceholderText("e.g., 42 (leave empty for random data)")
+        step1_layout.addWidget(self.seed_input)
+
+        schema_layout = QHBoxLayout()
+        self.schema_label = QLabel("Schema: default employee columns")
+        self.schema_label.setObjectName("infoLabel")
+        schema_layout.addWidget(self.schema_label)
+
+        self.schema_btn = QPushButton("📄 Load Schema...")
+        self.schema_btn.clicked.connect(self.select_schema)
+        schema_layout.addWidget(self.schema_btn)
+
+        self.snapshot_btn = QPushButton("📂 Open Snapshot...")
+        self.snapshot_btn.clicked.connect(self.open_snapshot)
+        schema_layout.addWidget(self.snapshot_btn)
+        step1_layout.addLayout(schema_layout)
         
         step1_group.setLayout(step1_layout)
         main_layout.addWidget(step1_group)
@@ -277,7 +322,7 @@ class EmployeeApp(QWidget):
         step2_group = QGroupBox("Step 2: Choose Output Folder")
         step2_layout = QVBoxLayout()
         
-        step2_info = QLabel("Select where you want to save the Excel file:")
+        step2_info = QLabel("Select where you want to save the exported file:")
         step2_info.setObjectName("infoLabel")
         step2_layout.addWidget(step2_info)
         
@@ -298,7 +343,7 @@ class EmployeeApp(QWidget):
         step3_group = QGroupBox("Step 3: Generate and Export Data")
         step3_layout = QVBoxLayout()
         
-        step3_info = QLabel("Generate employee data and export to Excel:")
+        step3_info = QLabel("Generate employee data and export it in the chosen format:")
         step3_info.setObjectName("infoLabel")
         step3_layout.addWidget(step3_info)
         
@@ -310,16 +355,60 @@ class EmployeeApp(QWidget):
         self.generate_btn.setEnabled(False)
         button_layout.addWidget(self.generate_btn)
 
-        self.export_btn = QPushButton("📊 Export to Excel")
+        self.format_combo = QComboBox()
+        for fmt, (label, _) in EXPORT_FORMATS.items():
+            self.format_combo.addItem(label, fmt)
+        self.format_combo.currentIndexChanged.connect(self.reset_export_button)
+        button_layout.addWidget(self.format_combo)
+
+        self.export_btn = QPushButton()
         self.export_btn.setObjectName("secondaryButton")
         self.export_btn.clicked.connect(self.export_excel)
         self.export_btn.setEnabled(False)
+        self.reset_export_button()
         button_layout.addWidget(self.export_btn)
+
+        self.cancel_btn = QPushButton("✖ Cancel")
+        self.cancel_btn.clicked.connect(self.cancel_job)
+        self.cancel_btn.setVisible(False)
+        button_layout.addWidget(self.cancel_btn)
         
         step3_layout.addLayout(button_layout)
         step3_group.setLayout(step3_layout)
         main_layout.addWidget(step3_group)
 
+        # Data preview, hidden until data has been generated
+        self.preview_group = QGroupBox("Data Preview")
+        preview_layout = QVBoxLayout()
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("🔍 Filter by name or department...")
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(300)  # filter once typing pauses
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_input.textChanged.connect(self.filter_timer.start)
+        preview_layout.addWidget(self.filter_input)
+
+        self.preview_model = FrameTableModel(self)
+        self.preview_table = QTableView()
+        self.preview_table.setModel(self.preview_model)
+        self.preview_table.setSortingEnabled(True)
+        self.preview_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.preview_table.horizontalHeader().setStretchLastSection(True)
+        self.preview_table.horizontalHeader().setResizeContentsPrecision(50)  # size columns from 50 rows
+        self.preview_table.verticalHeader().setDefaultSectionSize(22)
+        self.preview_table.setMinimumHeight(200)
+        preview_layout.addWidget(self.preview_table)
+
+        self.preview_label = QLabel()
+        self.preview_label.setObjectName("infoLabel")
+        preview_layout.addWidget(self.preview_label)
+
+        self.preview_group.setLayout(preview_layout)
+        self.preview_group.setVisible(False)
+        main_layout.addWidget(self.preview_group, 1)
+
         # Status message
         self.message_label = QLabel("👋 Welcome! Start by entering the number of employees above.")
         self.message_label.setAlignment(Qt.AlignCenter)
@@ -347,9 +436,9 @@ class EmployeeApp(QWidget):
                 self.generate_btn.setEnabled(False)
                 self.message_label.setText("❌ Please enter a positive number.")
                 self.progress_bar.setValue(0)
-            elif num > 10000:
+            elif num > MAX_EMPLOYEES:
                 self.generate_btn.setEnabled(False)
-                self.message_label.setText("⚠️ Maximum 10,000 employees allowed.")
+                self.message_label.setText(f"⚠️ Maximum {MAX_EMPLOYEES:,} employees allowed.")
                 self.progress_bar.setValue(0)
             else:
                 self.generate_btn.setEnabled(True)
@@ -373,103 +462,202 @@ class EmployeeApp(QWidget):
             self.message_label.setText(f"✅ Folder selected! {self.get_next_step_message()}")
             self.update_export_button_state()
 
+    def select_schema(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Load Schema", "", "Schema files (*.json *.yaml *.yml)")
+        if not path:
+            return
+        from .schema import load_schema
+        try:
+            self.schema = load_schema(path)
+        except (OSError, ValueError, TypeError, ImportError) as e:
+            QMessageBox.warning(self, "Invalid Schema", f"Could not load the schema:\n{e}")
+            return
+        names = ", ".join(column.name for column in self.schema.columns)
+        self.schema_label.setText(f"Schema: {self.schema.name} ({names})")
+
+    def has_data(self):
+        return self.data is not None and len(self.data) > 0
+
     def get_next_step_message(self):
         """Get appropriate next step message based on current state."""
-        if not self.data.empty and self.folder_path:
+        if self.has_data() and self.folder_path:
             return "Ready to export!"
-        elif not self.data.empty:
+        elif self.has_data():
             return "Now select a folder to export the data."
         elif self.num_input.text().strip() and self.folder_path:
             return "Now generate the employee data."
         else:
             return ""
 
+    def reset_export_button(self):
+        """Label the export button with the currently selected format."""
+        self.export_btn.setText(f"📊 Export to {self.format_combo.currentText()}")
+
     def update_export_button_state(self):
         """Enable export button only when data exists and folder is selected."""
-        self.export_btn.setEnabled(not self.data.empty and bool(self.folder_path))
-        if not self.data.empty and self.folder_path:
+        self.export_btn.setEnabled(self.has_data() and bool(self.folder_path))
+        if self.has_data() and self.folder_path:
             self.progress_bar.setValue(3)
 
+    def start_job(self, job, total, label, on_finished):
+        """Run ``job`` on the thread pool, showing row progress and a Cancel button."""
+        self.job = job
+        self.generate_btn.setEnabled(False)
+        self.export_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(True)
+
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat(f"{label}... %p%")
+
+        job.signals.progress.connect(self.progress_bar.setValue)
+        job.signals.finished.connect(on_finished)
+        job.signals.failed.connect(self.on_job_failed)
+        job.signals.cancelled.connect(self.on_job_cancelled)
+        QThreadPool.globalInstance().start(job)
+
+    def end_job(self, step):
+        """Restore the step indicator and buttons after a job ends."""
+        self.job = None
+        self.cancel_btn.setVisible(False)
+        self.progress_bar.setMaximum(3)
+        self.progress_bar.setFormat("Step %v of %m")
+        self.validate_input()
+        self.progress_bar.setValue(step)
+        self.update_export_button_state()
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.message_label.setText("⏳ Cancelling...")
+
+    def on_job_failed(self, error):
+        self.end_job(1)
+        QMessageBox.critical(self, "Error", f"An error occurred:\n{error}")
+
+    def on_job_cancelled(self):
+        self.end_job(1)
+        self.message_label.setText("🚫 Operation cancelled.")
+
+    def closeEvent(self, event):
+        if self.job is not None:
+            self.job.cancel()
+            QThreadPool.globalInstance().waitForDone()
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+        super().closeEvent(event)
+
     def generate_data(self):
         try:
             n = int(self.num_input.text())
             if n <= 0:
                 QMessageBox.warning(self, "Invalid Input", "Please enter a positive number.")
                 return
-            if n > 10000:
-                QMessageBox.warning(self, "Too Many Records", "Maximum 10,000 employees allowed for performance reasons.")
+            if n > MAX_EMPLOYEES:
+                QMessageBox.warning(self, "Too Many Records", f"Maximum {MAX_EMPLOYEES:,} employees allowed.")
                 return
-                
-            # Show loading state
-            self.generate_btn.setText("🔄 Generating...")
-            self.generate_btn.setEnabled(False)
-            QApplication.processEvents()  # Update UI
-            
-            self.data = generate_employee_data(n)
-            
-            # Reset button state
-            self.generate_btn.setText("🎲 Generate Data")
-            self.generate_btn.setEnabled(True)
-            
-            self.message_label.setText(f"🎉 Successfully generated {len(self.data)} employee records! {self.get_next_step_message()}")
-            self.progress_bar.setValue(2)
-            self.update_export_button_state()
-            
         except ValueError:
             QMessageBox.warning(self, "Invalid Input", "Please enter a valid number.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred while generating data:\n{str(e)}")
-            self.generate_btn.setText("🎲 Generate Data")
-            self.generate_btn.setEnabled(True)
+            return
+
+        seed_text = self.seed_input.text().strip()
+        try:
+            seed = int(seed_text) if seed_text else None
+            if seed is not None and seed < 0:
+                raise ValueError
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Seed", "The seed must be a non-negative whole number.")
+            return
+
+        self.message_label.setText(f"🔄 Generating {n:,} employee records...")
+        job = Job(generate_job, n, seed, self.cache, self.schema, self.spool_dir)
+        self.start_job(job, n, "Generating", self.on_data_generated)
+
+    def open_snapshot(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Snapshot", "", "Snapshots (*.snapshot)")
+        if not path:
+            return
+        from .snapshot import read_snapshot
+        try:
+            data = read_snapshot(path)  # memory-mapped: rows are paged in as the preview shows them
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Invalid Snapshot", f"Could not open the snapshot:\n{e}")
+            return
+        self.show_data(data)
+        self.progress_bar.setValue(2)
+        self.update_export_button_state()
+        self.message_label.setText(f"📂 Opened {len(data):,} employee records. {self.get_next_step_message()}")
+
+    def show_data(self, data):
+        self.data = data
+        self.filter_input.blockSignals(True)
+        self.filter_input.clear()
+        self.filter_input.blockSignals(False)
+        self.preview_model.set_frame(data)
+        self.preview_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.preview_table.resizeColumnsToContents()
+        self.preview_group.setVisible(True)
+        self.update_preview_label()
+
+    def on_data_generated(self, data):
+        metrics = self.job.metrics
+        self.show_data(data)
+        self.end_job(2)
+        self.message_label.setText(
+            f"🎉 Successfully generated {len(self.data)} employee records! {self.get_next_step_message()}"
+            f"\n({self.cache.stats_text()})\n{metrics.summary_line()}"
+        )
+
+    def apply_filter(self):
+        self.preview_model.set_filter(self.filter_input.text())
+        self.update_preview_label()
+
+    def update_preview_label(self):
+        shown, total = self.preview_model.visible_rows(), len(self.data)
+        if shown == total:
+            self.preview_label.setText(f"{total:,} rows — click a column header to sort")
+        else:
+            self.preview_label.setText(f"{shown:,} of {total:,} rows match the filter")
 
     def export_excel(self):
-        if self.data.empty:
+        if not self.has_data():
             QMessageBox.warning(self, "No Data", "Please generate employee data first!")
             return
         if not self.folder_path:
             QMessageBox.warning(self, "No Folder Selected", "Please select an output folder first!")
             return
 
-        try:
-            # Show loading state
-            self.export_btn.setText("💾 Exporting...")
-            self.export_btn.setEnabled(False)
-            QApplication.processEvents()  # Update UI
-            
-            file_path = export_to_excel(self.data, self.folder_path)
-            
-            # Reset button state
-            self.export_btn.setText("📊 Export to Excel")
-            self.export_btn.setEnabled(True)
-            
-            self.message_label.setText("🎉 Excel file created successfully!")
-            self.progress_bar.setValue(3)
-            
-            # Show success dialog with file location
-            msg = QMessageBox(self)
-            msg.setIcon(QMessageBox.Information)
-            msg.setWindowTitle("Export Complete")
-            msg.setText("Employee data exported successfully!")
-            msg.setInformativeText(f"File saved at:\n{file_path}")
-            msg.addButton("Open Folder", QMessageBox.ActionRole)
-            msg.addButton("OK", QMessageBox.AcceptRole)
-            
-            # Center the dialog on the main window
-            self.center_dialog_on_window(msg)
-            
-            result = msg.exec()
-            if result == 0:  # Open Folder clicked
-                import subprocess
-                import os
-                if os.name == 'nt':  # Windows
-                    subprocess.run(['explorer', str(file_path.parent)])
-                elif os.name == 'posix':  # macOS/Linux
-                    subprocess.run(['xdg-open', str(file_path.parent)])
-                    
-        except Exception as e:
-            QMessageBox.critical(self, "Export Error", f"An error occurred while exporting:\n{str(e)}")
-            self.export_btn.setText("📊 Export to Excel")
-            self.export_btn.setEnabled(True)
+        self.message_label.setText(f"💾 Exporting to {self.format_combo.currentText()}...")
+        job = Job(export_job, self.data, self.folder_path, self.format_combo.currentData())
+        self.start_job(job, len(self.data), "Exporting", self.on_export_finished)
+
+    def on_export_finished(self, file_path):
+        metrics = self.job.metrics
+        self.end_job(3)
+        self.message_label.setText(f"🎉 {self.format_combo.currentText()} file created successfully!"
+                                   f"\n{metrics.summary_line()}")
+
+        # Show success dialog with file location
+        msg = QMessageBox(self)
+        msg.setIcon(QMessageBox.Information)
+        msg.setWindowTitle("Export Complete")
+        msg.setText("Employee data exported successfully!")
+        msg.setInformativeText(f"File saved at:\n{file_path}")
+        msg.addButton("Open Folder", QMessageBox.ActionRole)
+        msg.addButton("OK", QMessageBox.AcceptRole)
+
+        # Center the dialog on the main window
+        self.center_dialog_on_window(msg)
+
+        result = msg.exec()
+        if result == 0:  # Open Folder clicked
+            import subprocess
+            import os
+            if os.name == 'nt':  # Windows
+                subprocess.run(['explorer', str(file_path.parent)])
+            elif os.name == 'posix':  # macOS/Linux
+                subprocess.run(['xdg-open', str(file_path.parent)])
 
 def run_app():
     app = QApplication(sys.argv)
@@ -0,0 +1,167 @@
+"""Incremental append: grow an exported dataset without regenerating it.
+
+Generated rows depend only on the master seed and ``emp_id`` (see
+``generate_employee_range``), so a dataset of ``rows`` employees is extended
+by generating ``emp_id`` ``rows + 1`` onwards with the same seed, and the
+result matches generating the larger dataset in one go. Appendable exports
+record a ``DatasetState`` with the seed, row count, custom schema and the
+summary accumulator's state, so the summaries are updated from the new rows
+alone:
+
+- CSV, JSON Lines, SQLite and snapshot files: ``employees.csv.state.json`` beside the file
+- sharded runs (e.g. a Parquet dataset): the run's ``_manifest.json`` (see ``shards.py``)
+- database tables: a ``{table}_state`` table (see ``database.py``)
+
+``export_data`` deletes a file's saved state whenever it rewrites the file,
+and ``append_dataset`` refuses files whose row count no longer matches it.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+from .exporter import APPEND_FORMATS, export_data, state_path
+from .generator import DEFAULT_CHUNK_SIZE, iter_employee_chunks, resolve_seed
+from .summary import SummaryAccumulator
+
+if TYPE_CHECKING:
+    from .schema import Schema
+
+
+@dataclass(frozen=True)
+class DatasetState:
+    seed: int
+    rows: int
+    schema: dict = None  # Schema.to_dict() of a custom schema
+    summary: dict = None  # SummaryAccumulator.to_state()
+
+    @classmethod
+    def create(cls, seed: int, rows: int, schema: Schema = None, summary: SummaryAccumulator = None) -> DatasetState:
+        return cls(seed, rows, schema.to_dict() if schema is not None else None,
+                   summary.to_state() if summary is not None else None)
+
+    @property
+    def next_id(self) -> int:
+        return self.rows + 1
+
+    def load_schema(self) -> Schema | None:
+        if self.schema is None:
+            return None
+        from .schema import Schema
+        return Schema.from_dict(self.schema)
+
+    def load_summary(self) -> SummaryAccumulator:
+        if self.summary is None:
+            raise ValueError("The dataset state has no summary to extend.")
+        return SummaryAccumulator.from_state(self.summary)
+
+    def extended(self, rows: int, summary: SummaryAccumulator) -> DatasetState:
+        """The state after appending ``rows`` employees that were folded into ``summary``."""
+        return replace(self, rows=self.rows + rows, summary=summary.to_state())
+
+
+def read_state(file_path) -> DatasetState:
+    """The state saved beside an exported file."""
+    try:
+        text = state_path(file_path).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        raise ValueError(f"{file_path} has no saved dataset state; only datasets exported with "
+                         "their state (e.g. by the command line) can be appended to.") from None
+    return DatasetState(**json.loads(text))
+
+
+def write_state(file_path, state: DatasetState) -> Path:
+    """Save ``state`` beside an exported file (atomically) and return its path."""
+    path = state_path(file_path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(json.dumps(asdict(state)), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def count_rows(file_path, fmt: str, name: str = "employees") -> int:
+    """Rows in an appendable ``fmt`` export, to check it still matches its saved state."""
+    if fmt == "sqlite":
+        import sqlite3
+        from .database import quote
+        connection = sqlite3.connect(file_path)
+        try:
+            return connection.execute(f"SELECT COUNT(*) FROM {quote(name)}").fetchone()[0]
+        finally:
+            connection.close()
+    if fmt == "snapshot":
+        from .snapshot import Snapshot
+        return len(Snapshot(file_path))
+    # CSV and JSON Lines hold one row per line, after the CSV header
+    with open(file_path, "rb") as f:
+        lines = sum(block.count(b"\n") for block in iter(lambda: f.read(1 << 20), b""))
+    return lines - 1 if fmt == "csv" else lines
+
+
+def export_dataset(n: int, folder_path: str, fmt: str = "csv", seed: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   workers: int = 1, schema: Schema = None, **options) -> Path:
+    """Generate and export ``n`` employees in an appendable ``fmt``, saving the dataset state."""
+    if fmt not in APPEND_FORMATS:
+        raise ValueError(f"Cannot append to {fmt!r} exports. Choose from {', '.join(APPEND_FORMATS)}.")
+    seed = resolve_seed(seed)
+    summary = SummaryAccumulator()
+    chunks = iter_employee_chunks(n, chunk_size=chunk_size, seed=seed, workers=workers, schema=schema)
+    file_path = export_data(chunks, folder_path, fmt, summary=summary, **options)
+    write_state(file_path, DatasetState.create(seed, n, schema, summary))
+    return file_path
+
+
+def append_dataset(n: int, folder_path: str, fmt: str = "csv", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   workers: int = 1, name: str = "employees", wrap=None, **options) -> Path:
+    """Append ``n`` more employees to the ``fmt`` export in ``folder_path``; return its path.
+
+    ``wrap(chunks)``, if given, wraps the stream of new chunks (e.g. to report progress).
+    """
+    if fmt not in APPEND_FORMATS:
+        raise ValueError(f"Cannot append to {fmt!r} exports. Choose from {', '.join(APPEND_FORMATS)}.")
+    if n <= 0:
+        raise ValueError("Number of employees must be positive.")
+    file_path = Path(folder_path) / f"{name}.{fmt}"
+    state = read_state(file_path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"Nothing to append to: {file_path} does not exist.")
+    rows = count_rows(file_path, fmt, name)
+    if rows != state.rows:
+        raise ValueError(f"{file_path} has {rows} rows but its saved state describes {state.rows}; "
+                         "it was changed after the state was saved, so it cannot be appended to.")
+    summary = state.load_summary()
+    chunks = iter_employee_chunks(n, chunk_size=chunk_size, seed=state.seed, start_id=state.next_id,
+                                  workers=workers, schema=state.load_schema())
+    file_path = APPEND_FORMATS[fmt](wrap(chunks) if wrap else chunks, folder_path, summary, name=name, **options)
+    write_state(file_path, state.extended(n, summary))
+    return file_path
+
+
+def load_dataset(n: int, connection, table: str = "employees", seed: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 workers: int = 1, schema: Schema = None, wrap=None, **options) -> int:
+    """Load ``n`` employees into a new database ``table`` and save the dataset state beside it."""
+    from .database import load_into_database, write_table_state
+    seed = resolve_seed(seed)
+    summary = SummaryAccumulator()
+    chunks = iter_employee_chunks(n, chunk_size=chunk_size, seed=seed, workers=workers, schema=schema)
+    rows = load_into_database(wrap(chunks) if wrap else chunks, connection, table=table, summary=summary, **options)
+    write_table_state(connection, table, asdict(DatasetState.create(seed, rows, schema, summary)))
+    return rows
+
+
+def append_to_database(n: int, connection, table: str = "employees", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       workers: int = 1, wrap=None, **options) -> int:
+    """Append ``n`` more employees to a ``table`` loaded by ``load_dataset``; return the rows added."""
+    from .database import load_into_database, read_table_state, write_table_state
+    if n <= 0:
+        raise ValueError("Number of employees must be positive.")
+    state = DatasetState(**read_table_state(connection, table))
+    summary = state.load_summary()
+    chunks = iter_employee_chunks(n, chunk_size=chunk_size, seed=state.seed, start_id=state.next_id,
+                                  workers=workers, schema=state.load_schema())
+    rows = load_into_database(wrap(chunks) if wrap else chunks, connection, table=table, create_table=False,
+                              summary=summary, **options)
+    write_table_state(connection, table, asdict(state.extended(rows, summary)))
+    return rows
@@ -0,0 +1,137 @@
+"""On-disk cache of generated datasets.
+
+Seeded datasets are stored as uncompressed Arrow IPC files, keyed by seed,
+locale, schema version and column spec, Faker version and generation date
+(hire dates run up to "today"). Because a seeded dataset's first ``n`` rows do not depend on its
+total size, a request for ``n`` rows is served from any cached entry with at
+least ``n`` rows by memory-mapping the file and slicing it. Entries are
+evicted least-recently-used first once the cache exceeds ``max_bytes``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from datetime import date
+from importlib.metadata import version
+from pathlib import Path
+from typing import TYPE_CHECKING
+from .generator import DEFAULT_CHUNK_SIZE, LOCALE, SCHEMA_VERSION, employee_dtypes, iter_employee_chunks
+from .metrics import stage
+from .names import get_cache_dir
+from .schema import default_schema
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from .schema import Schema
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+
+class DatasetCache:
+    """LRU cache of seeded datasets with prefix reuse and hit/miss counters."""
+
+    def __init__(self, root: Path = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root) if root else get_cache_dir() / "datasets"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, seed: int, schema: Schema = None) -> str:
+        params = {
+            "seed": seed, "locale": LOCALE, "schema": SCHEMA_VERSION,
+            "columns": (schema or default_schema()).fingerprint(),
+            "faker": version("Faker"), "date": date.today().isoformat(),
+        }
+        return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _entries(self, seed: int = None, schema: Schema = None) -> list:
+        """(rows, path) of cached datasets, for ``seed`` (and ``schema``) only when given."""
+        pattern = f"employees-{self.key(seed, schema)}-*.arrow" if seed is not None else "employees-*.arrow"
+        return sorted((int(path.stem.rsplit("-", 1)[1]), path) for path in self.root.glob(pattern))
+
+    def lookup(self, n: int, seed: int, schema: Schema = None) -> Path | None:
+        """Smallest cached dataset for ``seed`` with at least ``n`` rows."""
+        for rows, path in self._entries(seed, schema):
+            if rows >= n:
+                return path
+        return None
+
+    def chunks(self, n: int, seed: int, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1,
+               schema: Schema = None) -> Iterator[pd.DataFrame]:
+        """Yield ``n`` seeded employees in chunks, from the cache when possible.
+
+        On a miss the data is generated and written to the cache as it streams.
+        """
+        path = self.lookup(n, seed, schema)
+        if path is not None:
+            self.hits += 1
+            os.utime(path)  # mark as recently used
+            return self._read(path, n, chunk_size, schema)
+        self.misses += 1
+        chunks = iter_employee_chunks(n, chunk_size=chunk_size, seed=seed, workers=workers, schema=schema)
+        return self._record(chunks, n, seed, schema)
+
+    def load(self, n: int, seed: int, schema: Schema = None) -> pd.DataFrame:
+        import pandas as pd
+        return pd.concat(self.chunks(n, seed, schema=schema), ignore_index=True)
+
+    def _read(self, path: Path, n: int, chunk_size: int, schema: Schema = None) -> Iterator[pd.DataFrame]:
+        import pandas as pd
+        import pyarrow as pa
+
+        # Memory-mapped, so slicing the first n rows reads nothing else
+        table = pa.ipc.open_file(pa.memory_map(str(path))).read_all().slice(0, n)
+        string_dtype = pd.StringDtype("pyarrow")
+        types = {pa.string(): string_dtype, pa.large_string(): string_dtype}
+        dtypes = employee_dtypes(schema)
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            with stage("cache.read", batch.num_rows):
+                chunk = batch.to_pandas(types_mapper=types.get).astype(dtypes)
+            yield chunk
+
+    def _record(self, chunks, n: int, seed: int, schema: Schema = None) -> Iterator[pd.DataFrame]:
+        import pyarrow as pa
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"employees-{self.key(seed, schema)}-{n}.arrow"
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        writer = None
+        try:
+            for chunk in chunks:
+                with stage("cache.write", len(chunk)):
+                    batch = pa.RecordBatch.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pa.ipc.new_file(str(tmp_path), batch.schema)
+                    writer.write_batch(batch)
+                yield chunk
+            writer.close()
+            writer = None
+            os.replace(tmp_path, path)
+        finally:
+            if writer is not None:
+                writer.close()
+            tmp_path.unlink(missing_ok=True)
+
+        # Shorter datasets for the same key are prefixes of this one
+        for rows, other in self._entries(seed, schema):
+            if rows < n:
+                other.unlink(missing_ok=True)
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used datasets until the cache fits in ``max_bytes``."""
+        entries = sorted((path.stat().st_mtime, path) for _, path in self._entries())
+        total = sum(path.stat().st_size for _, path in entries)
+        for _, path in entries:
+            if total <= self.max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+    def size_bytes(self) -> int:
+        return sum(path.stat().st_size for _, path in self._entries())
+
+    def stats_text(self) -> str:
+        return f"cache: {self.hits} hit{'s' * (self.hits != 1)}, {self.misses} miss{'es' * (self.misses != 1)}"
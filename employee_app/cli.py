@@ -0,0 +1,264 @@
+"""Headless command-line entry point: ``python -m employee_app``.
+
+Generates employees in chunks and streams them straight into an exporter.
+Nothing here imports Qt, so it runs on machines without a display.
+"""
+import argparse
+import os
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from .append import DatasetState, append_dataset, append_to_database, write_state
+from .database import DEFAULT_BATCH_ROWS
+from .exporter import APPEND_FORMATS, EXPORT_FORMATS, export_data, export_tables
+from .generator import DEFAULT_CHUNK_SIZE, iter_employee_chunks, resolve_seed
+from .relations import TABLES, FanOut, iter_related_tables
+from .shards import MANIFEST_NAME
+from .summary import SummaryAccumulator
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m employee_app",
+        description="Generate employee data and export it without the GUI.",
+    )
+    parser.add_argument("--count", type=int, required=True, help="number of employees to generate")
+    parser.add_argument("--seed", type=int, default=None, help="master seed for reproducible output")
+    parser.add_argument("--schema", default=None, help="JSON or YAML schema file describing the columns to generate")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="xlsx", help="output format (default: xlsx)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"rows generated per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="generator processes (default: 1; with --shards, one per shard up to the CPU count)")
+    parser.add_argument("--shards", type=int, default=None,
+                        help="write this many part files concurrently into a timestamped run folder with a manifest")
+    parser.add_argument("--compression", default=None, help="codec for parquet/feather output")
+    parser.add_argument("--cache", action="store_true",
+                        help="reuse (and store) seeded datasets in the on-disk cache; requires --seed")
+    parser.add_argument("--cache-dir", default=None, help="dataset cache folder (default: ~/.cache/employee_app/datasets)")
+    parser.add_argument("--tables", nargs="+", choices=TABLES, default=None,
+                        help="generate these related tables, each exported as its own sheet or file")
+    parser.add_argument("--salary-history", type=int, default=FanOut.salary_history,
+                        help=f"salary_history rows per employee (default: {FanOut.salary_history})")
+    parser.add_argument("--attendance-days", type=int, default=FanOut.attendance_days,
+                        help=f"attendance business days per employee (default: {FanOut.attendance_days})")
+    parser.add_argument("--reports", type=int, default=FanOut.reports,
+                        help=f"direct reports per manager (default: {FanOut.reports})")
+    parser.add_argument("--database", default=None,
+                        help="load into this SQLite file or SQLAlchemy URL instead of writing a file")
+    parser.add_argument("--table", default="employees", help="table for --database (default: employees)")
+    parser.add_argument("--replace", action="store_true", help="drop and reload the --database table if it exists")
+    parser.add_argument("--append", action="store_true",
+                        help="add --count employees to the dataset a previous run exported to --output or --database "
+                             "(csv, jsonl, sqlite, snapshot or a sharded run folder), continuing its ids and seed")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="rows per insert transaction for --database and sqlite output (default: 50000)")
+    parser.add_argument("--output", default=".", help="output folder (default: current directory)")
+    parser.add_argument("--quiet", action="store_true", help="do not report progress on stderr")
+    parser.add_argument("--metrics", action="store_true", help="print per-stage timings and throughput on stderr")
+    parser.add_argument("--metrics-json", default=None, help="write per-stage metrics to this JSON file")
+    parser.add_argument("--trace-memory", action="store_true", help="record per-stage peak memory with tracemalloc (slow)")
+    parser.add_argument("--profile", default=None, help="run under cProfile and save the stats to this file")
+    args = parser.parse_args(argv)
+
+    if args.count <= 0:
+        parser.error("--count must be positive")
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+    if args.workers is not None and args.workers <= 0:
+        parser.error("--workers must be positive")
+    if args.shards is not None and args.shards <= 0:
+        parser.error("--shards must be positive")
+    if args.seed is not None and args.seed < 0:
+        parser.error("--seed must not be negative")
+    if args.cache and args.seed is None:
+        parser.error("--cache requires --seed")
+    if args.compression is not None and (args.database or args.format not in ("parquet", "feather")):
+        parser.error("--compression only applies to parquet and feather output")
+    if args.batch_size is not None and args.batch_size <= 0:
+        parser.error("--batch-size must be positive")
+    if args.batch_size is not None and not (args.database or args.format == "sqlite"):
+        parser.error("--batch-size only applies to --database and sqlite output")
+    if args.append and (args.seed is not None or args.schema or args.cache or args.tables):
+        parser.error("--append continues the dataset's own seed and schema; "
+                     "it cannot be combined with --seed, --schema, --cache or --tables")
+    if args.replace and (not args.database or args.append):
+        parser.error("--replace only applies to --database loads without --append")
+    if args.database and (args.shards or args.tables):
+        parser.error("--database cannot be combined with --shards or --tables")
+    if args.tables and (args.cache or args.schema):
+        parser.error("--tables cannot be combined with --cache or --schema")
+    if args.shards and (args.cache or args.tables):
+        parser.error("--shards cannot be combined with --cache or --tables")
+    if args.workers is None:
+        args.workers = min(args.shards, os.cpu_count() or 1) if args.shards else 1
+    try:
+        args.fanout = FanOut(args.salary_history, args.attendance_days, args.reports)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def report_progress(chunks, total: int, stream=sys.stderr):
+    """Pass chunks through, writing a progress line to ``stream`` after each one."""
+    done = 0
+    started = time.perf_counter()
+    for chunk in chunks:
+        yield chunk
+        done += len(chunk)
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed else 0.0
+        stream.write(f"\r{done:,}/{total:,} rows ({done * 100 / total:.1f}%) {rate:,.0f} rows/s")
+        stream.flush()
+    stream.write("\n")
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not (args.metrics or args.metrics_json or args.trace_memory or args.profile):
+        return run(args)
+
+    from .metrics import Metrics
+    with Metrics(trace_memory=args.trace_memory, profile=args.profile is not None) as metrics:
+        code = run(args)
+    if args.metrics or args.trace_memory or not args.metrics_json:
+        print(metrics.report(), file=sys.stderr)
+    if args.metrics_json:
+        metrics.dump(args.metrics_json)
+    if args.profile:
+        metrics.dump_profile(args.profile)
+    return code
+
+
+def run(args) -> int:
+    options = {}
+    if args.compression is not None:
+        options["compression"] = args.compression
+    if args.batch_size is not None:
+        options["batch_size"] = args.batch_size
+
+    if args.tables:
+        return export_related_tables(args, options)
+
+    schema = None
+    if args.schema is not None:
+        from .schema import load_schema
+        try:
+            schema = load_schema(args.schema)
+        except (OSError, ValueError, TypeError, ImportError) as e:
+            print(f"error: could not load schema {args.schema}: {e}", file=sys.stderr)
+            return 2
+
+    if args.append:
+        try:
+            print(append_existing(args, options))
+        except (OSError, ValueError) as e:
+            print(f"error: could not append: {e}", file=sys.stderr)
+            return 2
+        return 0
+
+    if args.shards:
+        return export_shards(args, schema, options)
+
+    seed = resolve_seed(args.seed)
+    cache = None
+    if args.cache:
+        from .cache import DatasetCache
+        cache = DatasetCache(args.cache_dir)
+        chunks = cache.chunks(args.count, seed, chunk_size=args.chunk_size, workers=args.workers, schema=schema)
+    else:
+        chunks = iter_employee_chunks(args.count, chunk_size=args.chunk_size, seed=seed,
+                                      workers=args.workers, schema=schema)
+    if not args.quiet:
+        chunks = report_progress(chunks, args.count)
+
+    # Appendable outputs keep the seed and summary state so --append can extend them later
+    summary = SummaryAccumulator()
+    if args.database:
+        try:
+            result = load_database(args, chunks, seed, schema, summary)
+        except ValueError as e:
+            print(f"error: could not load: {e}", file=sys.stderr)
+            return 2
+    elif args.format in APPEND_FORMATS:
+        result = export_data(chunks, args.output, args.format, summary=summary, **options)
+        write_state(result, DatasetState.create(seed, args.count, schema, summary))
+    else:
+        result = export_data(chunks, args.output, args.format, **options)
+    if cache is not None and not args.quiet:
+        print(cache.stats_text(), file=sys.stderr)
+    print(result)
+    return 0
+
+
+def append_existing(args, options: dict) -> str:
+    wrap = None if args.quiet else (lambda chunks: report_progress(chunks, args.count))
+    if args.database:
+        from .database import connect
+        connection = connect(args.database)
+        try:
+            rows = append_to_database(args.count, connection, table=args.table, chunk_size=args.chunk_size,
+                                      workers=args.workers, wrap=wrap, batch_size=args.batch_size or DEFAULT_BATCH_ROWS)
+        finally:
+            _close(connection)
+        return f"{rows} rows appended to {args.table}"
+
+    manifest_path = Path(args.output) / MANIFEST_NAME
+    if manifest_path.exists():
+        from .shards import append_sharded
+        manifest_path = append_sharded(manifest_path, args.count, shards=args.shards or 1, workers=args.workers,
+                                       chunk_size=args.chunk_size, progress=None if args.quiet else report_shards,
+                                       **options)
+        if not args.quiet:
+            sys.stderr.write("\n")
+        return str(manifest_path)
+    return str(append_dataset(args.count, args.output, args.format, chunk_size=args.chunk_size,
+                              workers=args.workers, wrap=wrap, **options))
+
+
+def export_related_tables(args, options: dict) -> int:
+    tables = iter_related_tables(args.count, seed=args.seed, chunk_size=args.chunk_size, workers=args.workers,
+                                 fanout=args.fanout, tables=args.tables)
+    if "employees" in tables and not args.quiet:
+        tables["employees"] = report_progress(tables["employees"], args.count)
+
+    paths = export_tables(tables, args.output, args.format, **options)
+    for file_path in dict.fromkeys(paths.values()):
+        print(file_path)
+    return 0
+
+
+def export_shards(args, schema, options: dict) -> int:
+    from .shards import export_sharded
+    manifest_path = export_sharded(args.count, args.output, args.format, shards=args.shards, workers=args.workers,
+                                   seed=args.seed, chunk_size=args.chunk_size, schema=schema,
+                                   progress=None if args.quiet else report_shards, **options)
+    if not args.quiet:
+        sys.stderr.write("\n")
+    print(manifest_path)
+    return 0
+
+
+def report_shards(done: int, total: int):
+    sys.stderr.write(f"\r{done}/{total} shards written")
+    sys.stderr.flush()
+
+
+def load_database(args, chunks, seed: int, schema, summary: SummaryAccumulator) -> str:
+    from .database import connect, load_into_database, table_exists, write_table_state
+    connection = connect(args.database)
+    try:
+        if not args.replace and table_exists(connection, args.table):
+            raise ValueError(f"table {args.table!r} already exists; use --append to add rows or --replace to reload it")
+        rows = load_into_database(chunks, connection, table=args.table, batch_size=args.batch_size or DEFAULT_BATCH_ROWS,
+                                  replace=args.replace, summary=summary)
+        write_table_state(connection, args.table, asdict(DatasetState.create(seed, rows, schema, summary)))
+    finally:
+        _close(connection)
+    return f"{rows} rows loaded into {args.table}"
+
+
+def _close(connection):
+    # SQLAlchemy engines are disposed, DB-API connections closed
+    (connection.dispose if hasattr(connection, "dispose") else connection.close)()
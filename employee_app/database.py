@@ -0,0 +1,232 @@
+"""Bulk loading of generated chunks into SQL databases.
+
+``load_into_database`` streams DataFrame chunks into a table through any
+DB-API 2.0 connection (``sqlite3``, psycopg, ...) or SQLAlchemy engine. Rows
+go in with ``executemany`` (or the COPY protocol on PostgreSQL drivers that
+offer it) in batches of ``batch_size``, each batch in its own transaction.
+Indexes are created after the last batch, so they are built once instead of
+being updated row by row.
+"""
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+from .exporter import iter_frame_chunks
+from .metrics import stage
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from .summary import SummaryAccumulator
+
+DEFAULT_BATCH_ROWS = 50_000
+
+
+def connect(target: str):
+    """Open ``target``: a SQLAlchemy URL (``dialect://...``) or a SQLite file path."""
+    if "://" in target:
+        try:
+            from sqlalchemy import create_engine
+        except ImportError:
+            raise ImportError("Database URLs require SQLAlchemy: pip install sqlalchemy") from None
+        return create_engine(target)
+    import sqlite3
+    return sqlite3.connect(target)
+
+
+def _dbapi_connection(connection):
+    """Return ``(DB-API connection, paramstyle, close when done)`` for a connection or engine."""
+    if hasattr(connection, "raw_connection"):  # SQLAlchemy Engine
+        return connection.raw_connection(), connection.dialect.paramstyle, True
+    module = sys.modules[type(connection).__module__.split(".")[0]]
+    return connection, getattr(module, "paramstyle", "qmark"), False
+
+
+def quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def column_type(dtype, sqlite: bool) -> str:
+    """SQL type for a pandas dtype; SQLite gets its storage classes."""
+    import pandas as pd
+    if pd.api.types.is_bool_dtype(dtype):
+        return "INTEGER" if sqlite else "BOOLEAN"
+    if pd.api.types.is_integer_dtype(dtype):
+        if sqlite:
+            return "INTEGER"
+        size = pd.api.types.pandas_dtype(dtype).itemsize
+        return {1: "SMALLINT", 2: "SMALLINT", 4: "INTEGER"}.get(size, "BIGINT")
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL" if sqlite else "DOUBLE PRECISION"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TEXT" if sqlite else "TIMESTAMP"
+    return "TEXT"
+
+
+def _db_values(series: pd.Series) -> list:
+    """Column values as Python objects; datetimes become ISO strings and missing values None."""
+    import numpy as np
+    import pandas as pd
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        values = series.to_numpy(dtype="datetime64[s]")
+        whole_days = (values.astype(np.int64) % 86_400 == 0).all()
+        text = np.datetime_as_string(values, unit="D" if whole_days else "s").astype(object)
+        text[np.isnat(values)] = None
+        return text.tolist()
+    if series.hasnans:
+        return series.astype(object).where(series.notna(), None).tolist()
+    return series.tolist()
+
+
+def load_into_database(data, connection, table: str = "employees", batch_size: int = DEFAULT_BATCH_ROWS,
+                       create_table: bool = True, replace: bool = False, primary_key: str = "emp_id",
+                       indexes=("department",), summary: SummaryAccumulator = None) -> int:
+    """Stream ``data`` (a DataFrame or chunks) into ``table`` and return the number of rows loaded.
+
+    With ``create_table`` the table is created from the first chunk's dtypes
+    (dropped first with ``replace``); otherwise rows are appended to an
+    existing table. A unique index on ``primary_key`` and plain ``indexes``
+    are created after loading, for the columns that exist.
+    """
+    if batch_size <= 0:
+        raise ValueError("Batch size must be positive.")
+    raw, paramstyle, close = _dbapi_connection(connection)
+    sqlite = type(raw).__module__.startswith("sqlite3")
+    cursor = raw.cursor()
+    loaded = 0
+    columns = None
+    try:
+        for chunk in iter_frame_chunks(data):
+            if summary is not None:
+                summary.update(chunk)
+            if columns is None:
+                columns = list(chunk.columns)
+                if create_table:
+                    _create_table(cursor, table, chunk.dtypes, replace, sqlite)
+                    raw.commit()
+                insert = _insert_statement(table, columns, paramstyle)
+            for start in range(0, len(chunk), batch_size):
+                batch = chunk.iloc[start:start + batch_size]
+                with stage("export.write", len(batch)):
+                    rows = list(zip(*(_db_values(batch[name]) for name in columns)))
+                    if not _copy_rows(cursor, table, columns, rows):
+                        cursor.executemany(insert, _parameters(rows, paramstyle))
+                    raw.commit()  # one transaction per batch
+                loaded += len(batch)
+
+        if columns is not None:
+            with stage("export.index"):
+                if primary_key in columns:
+                    cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {quote(f'{table}_{primary_key}_key')} "
+                                   f"ON {quote(table)} ({quote(primary_key)})")
+                for name in indexes:
+                    if name in columns and name != primary_key:
+                        cursor.execute(f"CREATE INDEX IF NOT EXISTS {quote(f'{table}_{name}_idx')} ON {quote(table)} ({quote(name)})")
+                raw.commit()
+    except BaseException:
+        raw.rollback()
+        raise
+    finally:
+        cursor.close()
+        if close:
+            raw.close()
+    return loaded
+
+
+def table_exists(connection, table: str) -> bool:
+    """Whether ``table`` exists in the database behind ``connection``."""
+    raw, _, close = _dbapi_connection(connection)
+    cursor = raw.cursor()
+    try:
+        cursor.execute(f"SELECT 1 FROM {quote(table)} WHERE 1 = 0")
+        return True
+    except Exception:  # each driver raises its own "no such table" error
+        raw.rollback()
+        return False
+    finally:
+        cursor.close()
+        if close:
+            raw.close()
+
+
+def _create_table(cursor, table: str, dtypes, replace: bool, sqlite: bool):
+    if replace:
+        cursor.execute(f"DROP TABLE IF EXISTS {quote(table)}")
+    definitions = ", ".join(f"{quote(name)} {column_type(dtype, sqlite)}" for name, dtype in dtypes.items())
+    cursor.execute(f"CREATE TABLE {quote(table)} ({definitions})")
+
+
+def _insert_statement(table: str, columns: list, paramstyle: str) -> str:
+    if paramstyle in ("format", "pyformat"):  # pyformat drivers also take positional %s
+        values = ["%s"] * len(columns)
+    elif paramstyle == "numeric":
+        values = [f":{i + 1}" for i in range(len(columns))]
+    elif paramstyle == "named":
+        values = [f":c{i}" for i in range(len(columns))]
+    else:
+        values = ["?"] * len(columns)
+    return f"INSERT INTO {quote(table)} ({', '.join(quote(name) for name in columns)}) VALUES ({', '.join(values)})"
+
+
+def _parameters(rows: list, paramstyle: str) -> list:
+    if paramstyle == "named":
+        return [{f"c{i}": value for i, value in enumerate(row)} for row in rows]
+    return rows
+
+
+def _copy_rows(cursor, table: str, columns: list, rows: list) -> bool:
+    """Load ``rows`` with PostgreSQL's COPY when the driver supports it; return whether it did."""
+    target = f"{quote(table)} ({', '.join(quote(name) for name in columns)})"
+    if hasattr(cursor, "copy_expert"):  # psycopg2
+        import csv
+        import io
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {target} FROM STDIN WITH (FORMAT csv)", buffer)
+        return True
+    if hasattr(cursor, "copy") and type(cursor).__module__.startswith("psycopg"):  # psycopg 3
+        with cursor.copy(f"COPY {target} FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+        return True
+    return False
+
+
+def write_table_state(connection, table: str, state: dict):
+    """Store ``state`` as JSON in the one-row ``{table}_state`` table (see ``append.py``)."""
+    import json
+    raw, paramstyle, close = _dbapi_connection(connection)
+    cursor = raw.cursor()
+    try:
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {quote(f'{table}_state')} (state TEXT)")
+        cursor.execute(f"DELETE FROM {quote(f'{table}_state')}")
+        cursor.execute(_insert_statement(f"{table}_state", ["state"], paramstyle),
+                       _parameters([(json.dumps(state),)], paramstyle)[0])
+        raw.commit()
+    except BaseException:
+        raw.rollback()
+        raise
+    finally:
+        cursor.close()
+        if close:
+            raw.close()
+
+
+def read_table_state(connection, table: str) -> dict:
+    """The state stored by ``write_table_state`` for ``table``."""
+    import json
+    raw, _, close = _dbapi_connection(connection)
+    cursor = raw.cursor()
+    try:
+        cursor.execute(f"SELECT state FROM {quote(f'{table}_state')}")
+        row = cursor.fetchone()
+    except Exception:
+        raw.rollback()
+        row = None
+    finally:
+        cursor.close()
+        if close:
+            raw.close()
+    if row is None:
+        raise ValueError(f"Table {table!r} has no saved dataset state to append to.")
+    return json.loads(row[0])
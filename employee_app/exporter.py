@@ -1,25 +1,413 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
 from datetime import datetime
-import pandas as pd
 from pathlib import Path
+from typing import TYPE_CHECKING
+from .metrics import record, stage
+from .summary import SummaryAccumulator
+
+# pandas and the file-format libraries are imported by the writers that need
+# them, so the GUI and CLI can list formats without loading them.
+if TYPE_CHECKING:
+    import pandas as pd
+
+EXCEL_MAX_ROWS = 1_048_576  # per worksheet, including the header row
+EXPORT_FORMATS = {}  # format name -> (label, export function)
+APPEND_FORMATS = {}  # format name -> append function
+# Related tables keyed by emp_id without being unique on it; they get a plain emp_id index
+EMP_ID_CHILD_TABLES = ("managers", "salary_history", "attendance")
+
+
+def register_format(name: str, label: str):
+    """Register an export function under ``name`` for ``export_data``.
+
+    Export functions take ``(data, folder_path, **options)`` and return the
+    file path. Every chunk is folded into a ``summary`` accumulator, the
+    caller's when given (e.g. to save the dataset state), and the summary
+    tables are written beside the data unless ``summary_files`` is false (e.g.
+    for a sharded export merging its parts into the manifest).
+    """
+    def decorator(func):
+        EXPORT_FORMATS[name] = (label, func)
+        return func
+    return decorator
+
+
+def register_append(name: str):
+    """Register a function that appends to files written by the ``name`` export function.
+
+    Append functions take ``(data, folder_path, summary, **options)``. They add
+    the rows to the existing file, update ``summary`` (the accumulator of the
+    rows already there) and rewrite the summaries from it; see ``append.py``.
+    """
+    def decorator(func):
+        APPEND_FORMATS[name] = func
+        return func
+    return decorator
+
+
+def export_data(data, folder_path: str, fmt: str = "xlsx", **options):
+    """Export ``data`` with the registered ``fmt`` writer and return the file path."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt!r}. Choose from {', '.join(EXPORT_FORMATS)}.")
+    _, export = EXPORT_FORMATS[fmt]
+    file_path = export(data, folder_path, **options)
+    # The rows were rewritten, so any saved dataset state is stale; appendable callers save a new one
+    state_path(file_path).unlink(missing_ok=True)
+    record("export.write", nbytes=file_path.stat().st_size)
+    return file_path
+
+
+def export_tables(tables: dict, folder_path: str, fmt: str = "xlsx", **options) -> dict:
+    """Export related ``{name: data}`` tables and return ``{name: file path}``.
+
+    Excel gets one workbook, ``tables.xlsx``, with a sheet per table; other
+    formats write one ``{name}.{ext}`` file per table. Tables are streamed
+    one after another, so only one chunk of one table is in memory.
+    """
+    if fmt == "xlsx":
+        file_path = _write_workbook(tables, _prepare_file(folder_path, "tables.xlsx"),
+                                    options.get("max_rows_per_sheet", EXCEL_MAX_ROWS - 1))
+        return {name: file_path for name in tables}
+    return {name: export_data(data, folder_path, fmt, name=name, **options) for name, data in tables.items()}
+
+
+def iter_frame_chunks(data, chunk_size: int = None) -> Iterable[pd.DataFrame]:
+    """Normalize a DataFrame or an iterable of DataFrame chunks to an iterable of chunks.
+
+    A DataFrame is split into slices of ``chunk_size`` rows when given.
+    """
+    import pandas as pd
+    if isinstance(data, pd.DataFrame):
+        if chunk_size is None:
+            return [data]
+        return (data.iloc[start:start + chunk_size] for start in range(0, len(data), chunk_size))
+    return data
+
 
-def export_to_excel(df: pd.DataFrame, folder_path: str):
+def _excel_values(series: pd.Series) -> list:
+    """Column values for xlsxwriter; datetime columns become Excel date serial numbers."""
+    import numpy as np
+    import pandas as pd
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        epoch = np.datetime64("1899-12-30", "s")
+        return ((series.to_numpy(dtype="datetime64[s]") - epoch) / np.timedelta64(1, "D")).tolist()
+    if series.hasnans:
+        # Missing values (e.g. a nullable manager_id) become blank cells
+        return series.astype(object).where(series.notna(), None).tolist()
+    return series.tolist()
+
+
+def _prepare_file(folder_path: str, file_name: str) -> Path:
     folder = Path(folder_path)
     folder.mkdir(parents=True, exist_ok=True)
-    file_path = folder / "employees.xlsx"
+    return folder / file_name
+
+
+def _existing_file(folder_path: str, file_name: str) -> Path:
+    file_path = Path(folder_path) / file_name
+    if not file_path.exists():
+        raise FileNotFoundError(f"Nothing to append to: {file_path} does not exist.")
+    return file_path
+
+
+def state_path(file_path) -> Path:
+    """Where the dataset state of an appendable export is saved (see ``append.py``)."""
+    file_path = Path(file_path)
+    return file_path.with_name(f"{file_path.name}.state.json")
+
+
+def _summary_path(file_path: Path, table: str = "summary") -> Path:
+    return file_path.with_name(f"{file_path.stem}_{table}{file_path.suffix}")
+
+
+def _write_summary_files(summary: SummaryAccumulator, file_path: Path, write):
+    """Write the summary and hire-year tables next to ``file_path`` with ``write(frame, path)``.
+
+    Tables without department statistics (such as salary history) get none.
+    """
+    if summary.rows and not summary.departments:
+        return
+    with stage("export.summary_files"):
+        write(summary.to_frame(), _summary_path(file_path))
+        write(summary.hire_year_frame(), _summary_path(file_path, "hire_years"))
+
+
+@register_format("xlsx", "Excel")
+def export_to_excel(data, folder_path: str, max_rows_per_sheet: int = EXCEL_MAX_ROWS - 1, name: str = "employees",
+                    summary: SummaryAccumulator = None, summary_files: bool = True):
+    """Write employees to ``employees.xlsx`` (or ``{name}.xlsx``) in ``folder_path``.
+
+    ``data`` may be a DataFrame or an iterable of DataFrame chunks (such as
+    ``iter_employee_chunks``). Rows are streamed with xlsxwriter's
+    ``constant_memory`` mode, rolling over to "Employees_2", "Employees_3", ...
+    once a sheet holds ``max_rows_per_sheet`` rows, and the Summary sheet is
+    built from running totals, so the full dataset is never held in memory.
+    """
+    return _write_workbook({name: data}, _prepare_file(folder_path, f"{name}.xlsx"), max_rows_per_sheet, summary,
+                           summary_files)
+
+
+def _write_workbook(tables: dict, file_path: Path, max_rows_per_sheet: int,
+                    shared_summary: SummaryAccumulator = None, summary_sheet: bool = True) -> Path:
+    """Stream each ``{name: data}`` table into its own sheet(s), then add the Summary sheet.
+
+    With ``shared_summary`` (single table only) the rows are accumulated into
+    it; ``summary_sheet=False`` leaves out the Summary sheet.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(file_path, {"constant_memory": True, "default_date_format": "yyyy-mm-dd"})
+    try:
+        header_format = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        date_format = workbook.add_format({"num_format": "yyyy-mm-dd"})
+
+        summaries = []
+        for name, data in tables.items():
+            summary = SummaryAccumulator() if shared_summary is None else shared_summary
+            summaries.append(summary)
+            title = name.replace("_", " ").title()
+            sheets = 0
+            sheet_row = max_rows_per_sheet + 1
+            for chunk in iter_frame_chunks(data):
+                summary.update(chunk)
+                with stage("export.convert", len(chunk)):
+                    columns = [_excel_values(chunk[column]) for column in chunk.columns]
+
+                with stage("export.write", len(chunk)):
+                    offset = 0
+                    while offset < len(chunk):
+                        if sheet_row > max_rows_per_sheet:
+                            sheets += 1
+                            sheet = workbook.add_worksheet(title if sheets == 1 else f"{title}_{sheets}")
+                            sheet.write_row(0, 0, list(chunk.columns), header_format)
+                            for col, dtype in enumerate(chunk.dtypes):
+                                if dtype.kind == "M":
+                                    sheet.set_column(col, col, 12, date_format)
+                            sheet_row = 1
+
+                        stop = min(len(chunk), offset + max_rows_per_sheet - sheet_row + 1)
+                        for row in zip(*(values[offset:stop] for values in columns)):
+                            sheet.write_row(sheet_row, 0, row)
+                            sheet_row += 1
+                        offset = stop
+
+        if not summary_sheet:
+            return file_path
+
+        # Summary sheet, from the table with department statistics (the employees)
+        summary = next((summary for summary in summaries if summary.departments), summaries[0])
+        with stage("export.summary_files"):
+            summary_frame = summary.to_frame()
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+            # Write timestamp & summary starting at row 2, hire years below it
+            sheet = workbook.add_worksheet("Summary")
+            sheet.write(0, 0, f"Exported on: {timestamp}")
+            row = 2
+            for table in (summary_frame, summary.hire_year_frame()):
+                sheet.write_row(row, 0, list(table.columns), header_format)
+                for row, values in enumerate(table.itertuples(index=False), start=row + 1):
+                    sheet.write_row(row, 0, values)
+                row += 2
+    finally:
+        # Closing assembles the streamed sheets into the .xlsx zip
+        with stage("export.close"):
+            workbook.close()
+
+    return file_path
+
+
+@register_format("parquet", "Parquet")
+def export_to_parquet(data, folder_path: str, compression: str = "snappy", name: str = "employees",
+                      summary: SummaryAccumulator = None, summary_files: bool = True):
+    """Write employees to ``employees.parquet`` (or ``{name}.parquet``), one row group per chunk.
+
+    ``compression`` is any codec pyarrow supports ("snappy", "zstd", "gzip",
+    "brotli", "lz4" or "none"). The summary goes to ``employees_summary.parquet``
+    and hire-year counts to ``employees_hire_years.parquet``.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    file_path = _prepare_file(folder_path, f"{name}.parquet")
+    summary = summary if summary is not None else SummaryAccumulator()
+    writer = None
+    try:
+        for chunk in iter_frame_chunks(data):
+            summary.update(chunk)
+            with stage("export.write", len(chunk)):
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(file_path, table.schema, compression=compression)
+                writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if summary_files:
+        _write_summary_files(summary, file_path,
+                             lambda frame, path: frame.to_parquet(path, index=False, compression=compression))
+    return file_path
+
+
+@register_format("feather", "Arrow IPC")
+def export_to_feather(data, folder_path: str, compression: str = "lz4", name: str = "employees",
+                      summary: SummaryAccumulator = None, summary_files: bool = True):
+    """Write employees to ``employees.feather`` (Arrow IPC file format), one record batch per chunk."""
+    import pyarrow as pa
+
+    file_path = _prepare_file(folder_path, f"{name}.feather")
+    summary = summary if summary is not None else SummaryAccumulator()
+    options = pa.ipc.IpcWriteOptions(compression=None if compression == "none" else compression)
+    writer = None
+    try:
+        for chunk in iter_frame_chunks(data):
+            summary.update(chunk)
+            with stage("export.write", len(chunk)):
+                batch = pa.RecordBatch.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pa.ipc.new_file(file_path, batch.schema, options=options)
+                writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if summary_files:
+        _write_summary_files(summary, file_path, lambda frame, path: frame.to_feather(path))
+    return file_path
+
+
+@register_format("csv", "CSV")
+def export_to_csv(data, folder_path: str, name: str = "employees", summary: SummaryAccumulator = None,
+                  summary_files: bool = True):
+    """Write employees to ``employees.csv`` chunk by chunk, plus summary and hire-year CSVs."""
+    file_path = _prepare_file(folder_path, f"{name}.csv")
+    summary = summary if summary is not None else SummaryAccumulator()
+    with open(file_path, "w", newline="", encoding="utf-8") as f:
+        for i, chunk in enumerate(iter_frame_chunks(data)):
+            summary.update(chunk)
+            with stage("export.write", len(chunk)):
+                chunk.to_csv(f, index=False, header=i == 0)
+
+    if summary_files:
+        _write_summary_files(summary, file_path, lambda frame, path: frame.to_csv(path, index=False))
+    return file_path
+
+
+@register_append("csv")
+def append_to_csv(data, folder_path: str, summary: SummaryAccumulator, name: str = "employees"):
+    """Append employees to ``employees.csv`` and rewrite its summary and hire-year CSVs."""
+    file_path = _existing_file(folder_path, f"{name}.csv")
+    with open(file_path, "a", newline="", encoding="utf-8") as f:
+        for chunk in iter_frame_chunks(data):
+            summary.update(chunk)
+            with stage("export.write", len(chunk)):
+                chunk.to_csv(f, index=False, header=False)
+
+    _write_summary_files(summary, file_path, lambda frame, path: frame.to_csv(path, index=False))
+    return file_path
+
+
+@register_format("jsonl", "JSON Lines")
+def export_to_jsonl(data, folder_path: str, name: str = "employees", summary: SummaryAccumulator = None,
+                    summary_files: bool = True):
+    """Write employees as newline-delimited JSON to ``employees.jsonl``, plus summary and hire-year files."""
+    file_path = _prepare_file(folder_path, f"{name}.jsonl")
+    summary = summary if summary is not None else SummaryAccumulator()
+    with open(file_path, "w", encoding="utf-8") as f:
+        for chunk in iter_frame_chunks(data):
+            summary.update(chunk)
+            with stage("export.write", len(chunk)):
+                chunk.to_json(f, orient="records", lines=True, date_format="iso")
+
+    if summary_files:
+        _write_summary_files(summary, file_path,
+                             lambda frame, path: frame.to_json(path, orient="records", lines=True))
+    return file_path
+
+
+@register_append("jsonl")
+def append_to_jsonl(data, folder_path: str, summary: SummaryAccumulator, name: str = "employees"):
+    """Append employees to ``employees.jsonl`` and rewrite its summary and hire-year files."""
+    file_path = _existing_file(folder_path, f"{name}.jsonl")
+    with open(file_path, "a", encoding="utf-8") as f:
+        for chunk in iter_frame_chunks(data):
+            summary.update(chunk)
+            with stage("export.write", len(chunk)):
+                chunk.to_json(f, orient="records", lines=True, date_format="iso")
+
+    _write_summary_files(summary, file_path, lambda frame, path: frame.to_json(path, orient="records", lines=True))
+    return file_path
+
+
+@register_format("sqlite", "SQLite")
+def export_to_sqlite(data, folder_path: str, batch_size: int = None, name: str = "employees",
+                     summary: SummaryAccumulator = None, summary_files: bool = True):
+    """Load employees into table ``employees`` of a fresh ``employees.sqlite``, with summary tables beside it."""
+    import sqlite3
+    from .database import DEFAULT_BATCH_ROWS, load_into_database
+    file_path = _prepare_file(folder_path, f"{name}.sqlite")
+    file_path.unlink(missing_ok=True)
+    summary = summary if summary is not None else SummaryAccumulator()
+    connection = sqlite3.connect(file_path)
+    try:
+        # A fresh file that is rebuilt on failure needs no rollback journal or fsyncs
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        load_into_database(data, connection, table=name, batch_size=batch_size or DEFAULT_BATCH_ROWS,
+                           summary=summary, **_table_keys(name))
+        if summary_files:
+            _write_summary_files(summary, file_path, lambda frame, path: load_into_database(
+                frame, connection, table=path.stem, primary_key=None, indexes=()))
+    finally:
+        connection.close()
+    return file_path
+
+
+def _table_keys(name: str) -> dict:
+    """``load_into_database`` keys for table ``name``: only ``employees`` has a unique ``emp_id``."""
+    if name in EMP_ID_CHILD_TABLES:
+        return {"primary_key": None, "indexes": ("emp_id",)}
+    return {}
+
+
+@register_append("sqlite")
+def append_to_sqlite(data, folder_path: str, summary: SummaryAccumulator, batch_size: int = None,
+                     name: str = "employees"):
+    """Append employees to table ``employees`` of ``employees.sqlite`` and replace its summary tables."""
+    import sqlite3
+    from .database import DEFAULT_BATCH_ROWS, load_into_database
+    file_path = _existing_file(folder_path, f"{name}.sqlite")
+    connection = sqlite3.connect(file_path)
+    try:
+        load_into_database(data, connection, table=name, batch_size=batch_size or DEFAULT_BATCH_ROWS,
+                           create_table=False, summary=summary, **_table_keys(name))
+        _write_summary_files(summary, file_path, lambda frame, path: load_into_database(
+            frame, connection, table=path.stem, replace=True, primary_key=None, indexes=()))
+    finally:
+        connection.close()
+    return file_path
 
-    with pd.ExcelWriter(file_path, engine="xlsxwriter") as writer:
-        # Employees sheet
-        df.to_excel(writer, index=False, sheet_name="Employees")
 
-        # Summary sheet
-        summary = df.groupby("department")["salary"].mean().reset_index()
-        summary.columns = ["Department", "Average Salary"]
+@register_format("snapshot", "Snapshot (memory-mapped)")
+def export_to_snapshot(data, folder_path: str, name: str = "employees", summary: SummaryAccumulator = None,
+                       summary_files: bool = True):
+    """Write employees to ``employees.snapshot``, with the summary and hire-year tables in its index.
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    The tables are part of the file rather than beside it, so ``summary_files`` does not apply.
+    """
+    from .snapshot import write_snapshot
+    file_path = _prepare_file(folder_path, f"{name}.snapshot")
+    write_snapshot(data, file_path, summary=summary if summary is not None else SummaryAccumulator())
+    return file_path
 
-        # Write timestamp & summary starting at row 2
-        summary.to_excel(writer, index=False, sheet_name="Summary", startrow=2)
-        sheet = writer.sheets["Summary"]
-        sheet.write(0, 0, f"Exported on: {timestamp}")
 
-    return file_path
\ No newline at end of file
+@register_append("snapshot")
+def append_to_snapshot(data, folder_path: str, summary: SummaryAccumulator, name: str = "employees"):
+    """Append employees to ``employees.snapshot`` as a new block, updating the summary tables in its index."""
+    from .snapshot import append_snapshot
+    file_path = _existing_file(folder_path, f"{name}.snapshot")
+    append_snapshot(data, file_path, summary=summary)
+    return file_path
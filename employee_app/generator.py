@@ -1,26 +1,233 @@
+from __future__ import annotations
+
+import os
 import random
-from datetime import date, datetime
-import pandas as pd
-from faker import Faker
+import threading
+from collections import deque
+from collections.abc import Iterator
+from datetime import date
+from typing import TYPE_CHECKING
+from .metrics import stage
+
+# numpy, pandas and Faker are imported where they are used, so importing this
+# module (e.g. for the GUI window or CLI --help) stays cheap.
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from .schema import Schema
 
-fake = Faker("en_PH")  # use Filipino/English locale
+LOCALE = "en_PH"  # use Filipino/English locale
 DEPARTMENTS = ["IT", "HR", "Operations", "Administration", "Finance"]
+SALARY_MIN = 25000
+SALARY_MAX = 120000
+START_DATE = date(2020, 1, 1)
+DEFAULT_CHUNK_SIZE = 100_000
+SCHEMA_VERSION = 2  # bump when generated columns, dtypes or distributions change
+BLOCK_SIZE = 10_000  # rows drawn from one derived seed; keep DEFAULT_CHUNK_SIZE a multiple
+
+_faker = None
+_last_block = threading.local()  # the most recent partially used block drawn on this thread
+
+
+def get_faker():
+    """Return the shared Faker instance, creating it on first use."""
+    global _faker
+    if _faker is None:
+        from faker import Faker
+        _faker = Faker(LOCALE)
+    return _faker
+
+
+def __getattr__(name):
+    # Keep ``generator.fake`` working without building Faker at import time
+    if name == "fake":
+        return get_faker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def generate_employee_data(n: int) -> pd.DataFrame:
+
+def generate_employee_data(n: int, vectorized: bool = False, seed: int = None, schema: Schema = None) -> pd.DataFrame:
+    """Generate ``n`` employee records.
+
+    By default every row is built with Faker. ``vectorized=True`` draws each
+    column as a whole NumPy array instead, which is much faster for large ``n``,
+    and is required for a custom ``schema``. ``seed`` makes either mode
+    reproducible.
+    """
     if n <= 0:
         raise ValueError("Number of employees must be positive.")
 
+    import pandas as pd
+    if vectorized:
+        return generate_employee_range(1, n + 1, resolve_seed(seed), schema)
+    if schema is not None:
+        raise ValueError("Custom schemas require vectorized generation.")
+
+    if seed is None:
+        faker, rnd = get_faker(), random
+    else:
+        from faker import Faker
+        faker, rnd = Faker(LOCALE), random.Random(seed)
+        faker.seed_instance(seed)
+
     data = []
-    start_date = datetime(2020, 1, 1).date()
     end_date = date.today()
-    
-    for i in range(1, n + 1):
-        data.append({
-            "emp_id": i,
-            "full_name": fake.name(),
-            "department": random.choice(DEPARTMENTS),
-            "salary": random.randint(25000, 120000),
-            "hire_date": fake.date_between(start_date=start_date, end_date=end_date)
-        })
-
-    return pd.DataFrame(data)
\ No newline at end of file
+
+    with stage("generate.faker", n):
+        for i in range(1, n + 1):
+            data.append({
+                "emp_id": i,
+                "full_name": faker.name(),
+                "department": rnd.choice(DEPARTMENTS),
+                "salary": rnd.randint(SALARY_MIN, SALARY_MAX),
+                "hire_date": faker.date_between(start_date=START_DATE, end_date=end_date)
+            })
+
+    with stage("generate.frame", n):
+        return pd.DataFrame(data).astype(employee_dtypes())
+
+
+def iter_employee_chunks(n: int, chunk_size: int = DEFAULT_CHUNK_SIZE, seed: int = None,
+                         start_id: int = 1, workers: int = 1, schema: Schema = None) -> Iterator[pd.DataFrame]:
+    """Yield ``n`` employees as DataFrames of at most ``chunk_size`` rows.
+
+    ``emp_id`` stays sequential across chunks, and only a bounded number of
+    chunks is held in memory at a time, so peak memory does not grow with ``n``.
+    With ``workers > 1`` chunks are generated in a process pool and yielded in
+    ``emp_id`` order. For a given ``seed`` the rows are identical whatever the
+    chunk size or worker count.
+    """
+    if n <= 0:
+        raise ValueError("Number of employees must be positive.")
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive.")
+
+    yield from iter_id_ranges(generate_employee_range, n, chunk_size, start_id, workers,
+                              resolve_seed(seed), schema)
+
+
+def iter_id_ranges(func, n: int, chunk_size: int, start_id: int = 1, workers: int = 1, *args) -> Iterator:
+    """Yield ``func(start, stop, *args)`` for consecutive id ranges covering ``n`` ids.
+
+    With ``workers > 1`` the ranges are computed in a process pool, keeping
+    only a couple of results in flight per worker, and yielded in id order.
+    """
+    ranges = ((start_id + offset, start_id + min(offset + chunk_size, n))
+              for offset in range(0, n, chunk_size))
+
+    if workers <= 1:
+        for start, stop in ranges:
+            yield func(start, stop, *args)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        try:
+            for start, stop in ranges:
+                pending.append(pool.submit(func, start, stop, *args))
+                # Keep a couple of chunks in flight per worker, not the whole run
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def generate_employee_data_parallel(n: int, workers: int = None, seed: int = None, schema: Schema = None) -> pd.DataFrame:
+    """Generate ``n`` employees across a process pool, one shard per worker.
+
+    Shards are contiguous ``emp_id`` ranges and are stitched back in order, so
+    the result equals ``generate_employee_data(n, vectorized=True, seed=seed)``.
+    """
+    if n <= 0:
+        raise ValueError("Number of employees must be positive.")
+
+    import pandas as pd
+    workers = workers or os.cpu_count() or 1
+    shard_blocks = -(-n // (workers * BLOCK_SIZE))
+    shards = iter_employee_chunks(n, chunk_size=shard_blocks * BLOCK_SIZE, seed=seed, workers=workers, schema=schema)
+    return pd.concat(shards, ignore_index=True)
+
+
+def resolve_seed(seed: int = None) -> int:
+    """Return ``seed``, or a fresh random master seed when it is ``None``."""
+    if seed is None:
+        import numpy as np
+        return int(np.random.SeedSequence().entropy)
+    return seed
+
+
+def generate_employee_range(start_id: int, stop_id: int, seed: int, schema: Schema = None) -> pd.DataFrame:
+    """Generate the employees with ``start_id <= emp_id < stop_id``.
+
+    Rows are drawn in fixed blocks of ``BLOCK_SIZE`` ids, each from its own
+    seed derived from ``seed`` and the block number, so any range can be
+    generated independently (e.g. by a different process) and still match.
+    """
+    import numpy as np
+    parts = []
+    for block in range((start_id - 1) // BLOCK_SIZE, (stop_id - 2) // BLOCK_SIZE + 1):
+        block_start = block * BLOCK_SIZE + 1
+        lo = max(start_id, block_start) - block_start
+        hi = min(stop_id, block_start + BLOCK_SIZE) - block_start
+        if hi - lo == BLOCK_SIZE:
+            parts.append(generate_employee_block(block, seed, schema))
+            continue
+        # Ranges smaller than a block share it; copies keep the cached block intact
+        key = ("employees", block, seed, schema.fingerprint() if schema is not None else None)
+        columns = cached_block(key, lambda: generate_employee_block(block, seed, schema))
+        parts.append({name: values[lo:hi].copy() for name, values in columns.items()})
+
+    if len(parts) == 1:
+        return employee_frame(parts[0], schema)
+    return employee_frame({name: np.concatenate([part[name] for part in parts]) for name in parts[0]}, schema)
+
+
+def generate_employee_block(block: int, seed: int, schema: Schema = None) -> dict:
+    """Raw columns of the ``BLOCK_SIZE`` employees in ``block``, drawn from its derived seed."""
+    import numpy as np
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+    return generate_employee_columns(BLOCK_SIZE, rng, block * BLOCK_SIZE + 1, schema)
+
+
+def cached_block(key, draw):
+    """Return ``draw()``, reusing the result while consecutive calls on this thread pass the same ``key``.
+
+    Chunks smaller than a block, or not aligned to one, then draw each block
+    once instead of once per chunk. Callers must not modify the result.
+    """
+    last = getattr(_last_block, "entry", None)
+    if last is not None and last[0] == key:
+        return last[1]
+    value = draw()
+    _last_block.entry = (key, value)
+    return value
+
+
+def generate_employee_columns(n: int, rng: np.random.Generator, start_id: int = 1, schema: Schema = None) -> dict:
+    """Draw ``n`` employees as raw columnar arrays, starting at ``emp_id == start_id``.
+
+    Category columns hold codes; ``employee_frame`` turns the arrays into the
+    compact DataFrame schema.
+    """
+    from .schema import compile_schema
+    return compile_schema(schema).columns(rng, n, start_id)
+
+
+def employee_dtypes(schema: Schema = None) -> dict:
+    """Column dtypes of generated employee frames.
+
+    Narrow integers, categoricals, Arrow-backed name strings and
+    second-resolution datetimes (the coarsest unit pandas stores) take a
+    fraction of the memory of object columns.
+    """
+    from .schema import compile_schema
+    return compile_schema(schema).dtypes()
+
+
+def employee_frame(columns: dict, schema: Schema = None) -> pd.DataFrame:
+    """Wrap arrays from ``generate_employee_columns`` in the compact employee schema."""
+    from .schema import compile_schema
+    return compile_schema(schema).frame(columns)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+from PySide6.QtCore import QObject, QRunnable, Signal
+from .cache import DatasetCache
+from .generator import iter_employee_chunks
+from .exporter import export_data, iter_frame_chunks, state_path
+from .metrics import Metrics
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from .schema import Schema
+
+EXPORT_PROGRESS_ROWS = 20_000  # rows written between progress updates
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once the user has asked to cancel it."""
+
+
+class JobSignals(QObject):
+    progress = Signal(int)  # rows processed so far
+    finished = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class Job(QRunnable):
+    """Run ``func(job, *args)`` on a QThreadPool worker thread.
+
+    ``func`` reports progress with ``job.report(rows_done)``, which raises
+    ``JobCancelled`` after ``cancel()`` so the work stops at the next chunk.
+    Results and errors are delivered to the GUI thread through ``signals``,
+    and per-stage timings of the run are collected in ``job.metrics``.
+    """
+
+    def __init__(self, func, *args):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.func = func
+        self.args = args
+        self.signals = JobSignals()
+        self.metrics = Metrics()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def report(self, rows_done: int):
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.signals.progress.emit(rows_done)
+
+    def run(self):
+        try:
+            with self.metrics:
+                result = self.func(self, *self.args)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+def generate_job(job: Job, n: int, seed: int = None, cache: DatasetCache = None,
+                 schema: Schema = None, spool_dir: str = None) -> pd.DataFrame:
+    """Generate ``n`` employees into a temporary snapshot and return it memory-mapped.
+
+    Chunks go to disk as they are generated, so the job holds one chunk, not
+    the dataset; the preview and exports then page rows in from the mapping
+    as they touch them. The file is created in ``spool_dir`` (default: the
+    system temporary folder) and unlinked once mapped where the platform
+    allows it; elsewhere it is left for the caller to remove with the folder.
+    """
+    from .snapshot import read_snapshot, write_snapshot
+    if cache is not None and seed is not None:
+        source = cache.chunks(n, seed, schema=schema)
+    else:
+        source = iter_employee_chunks(n, seed=seed, schema=schema)
+
+    def chunks():
+        done = 0
+        for chunk in source:
+            yield chunk
+            done += len(chunk)
+            job.report(done)
+
+    fd, name = tempfile.mkstemp(suffix=".snapshot", prefix="generated-", dir=spool_dir)
+    os.close(fd)
+    path = Path(name)
+    try:
+        write_snapshot(chunks(), path)
+        data = read_snapshot(path)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    try:
+        path.unlink()  # POSIX keeps the mapping alive without the name
+    except OSError:
+        pass  # Windows cannot delete a mapped file
+    return data
+
+
+def export_job(job: Job, data: pd.DataFrame, folder_path: str, fmt: str) -> Path:
+    """Export ``data`` to ``folder_path``, replacing earlier files only once it is fully written.
+
+    The writer works in a temporary folder beside the output, so a cancelled
+    or failed export leaves the previous file and its summaries untouched.
+    """
+    def chunks():
+        done = 0
+        for chunk in iter_frame_chunks(data, EXPORT_PROGRESS_ROWS):
+            yield chunk
+            # Resumed once the writer has consumed the previous chunk
+            done += len(chunk)
+            job.report(done)
+
+    folder = Path(folder_path)
+    folder.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix=".export-", dir=folder) as staging:
+        file_path = export_data(chunks(), staging, fmt)
+        state_path(folder / file_path.name).unlink(missing_ok=True)  # the previous export's, now stale
+        for path in Path(staging).iterdir():
+            os.replace(path, folder / path.name)
+    return folder / file_path.name
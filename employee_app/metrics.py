@@ -0,0 +1,193 @@
+"""Per-stage timing, throughput and memory instrumentation.
+
+Generation and export code marks its stages with ``stage(name, rows=...)``
+(``generate.name``, ``generate.frame``, ``export.write``, ``summary``, ...).
+Marks are no-ops unless a ``Metrics`` collector is active in the current
+thread or task::
+
+    with Metrics(trace_memory=True) as metrics:
+        export_data(iter_employee_chunks(1_000_000), "out", "parquet")
+    print(metrics.report())
+    metrics.dump("metrics.json")
+
+Stages that run in worker processes (``workers > 1``) are not timed; the
+collector's wall time still covers them.
+"""
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+_current = ContextVar("employee_app_metrics", default=None)
+_noop = nullcontext()
+
+
+@dataclass
+class StageStats:
+    seconds: float = 0.0
+    calls: int = 0
+    rows: int = 0
+    bytes: int = 0
+    peak_memory_bytes: int = None  # tracemalloc peak above the stage's starting point
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.seconds if self.seconds and self.rows else None
+
+
+class Metrics:
+    """Collects ``StageStats`` per stage while active (``with Metrics() as metrics``).
+
+    ``callback(name, stats)`` is called after every completed stage.
+    ``trace_memory`` records per-stage peak allocations with tracemalloc and
+    ``profile`` runs cProfile over the whole block; both slow the work down.
+    """
+
+    def __init__(self, callback=None, trace_memory: bool = False, profile: bool = False):
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.profile = profile
+        self.stages = {}
+        self.wall_seconds = 0.0
+        self.profiler = None
+        self._started = None
+        self._token = None
+
+    def __enter__(self) -> Metrics:
+        self._token = _current.set(self)
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall_seconds += time.perf_counter() - self._started
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.stop()
+        _current.reset(self._token)
+        return False
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0):
+        tracemalloc = None
+        if self.trace_memory:
+            import tracemalloc
+            start_memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats = self.add(name, time.perf_counter() - started, rows)
+            if tracemalloc is not None:
+                peak = tracemalloc.get_traced_memory()[1] - start_memory
+                stats.peak_memory_bytes = max(stats.peak_memory_bytes or 0, peak)
+            if self.callback:
+                self.callback(name, stats)
+
+    def add(self, name: str, seconds: float = 0.0, rows: int = 0, nbytes: int = 0, calls: int = 1) -> StageStats:
+        stats = self.stages.setdefault(name, StageStats())
+        stats.seconds += seconds
+        stats.calls += calls
+        stats.rows += rows
+        stats.bytes += nbytes
+        return stats
+
+    def to_dict(self) -> dict:
+        result = {
+            "wall_seconds": self.wall_seconds,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "stages": {name: {**asdict(stats), "rows_per_s": stats.rows_per_s} for name, stats in self.stages.items()},
+        }
+        if self.profiler is not None:
+            result["profile"] = self.top_functions()
+        return result
+
+    def dump(self, path):
+        """Write ``to_dict()`` as JSON to ``path``."""
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+    def dump_profile(self, path):
+        """Save the cProfile data (for ``pstats``/snakeviz) to ``path``."""
+        if self.profiler is None:
+            raise ValueError("Profiling was not enabled.")
+        self.profiler.dump_stats(str(path))
+
+    def top_functions(self, limit: int = 15) -> list:
+        """The ``limit`` functions with the most cumulative time, as dicts."""
+        import pstats
+        stats = pstats.Stats(self.profiler)
+        rows = []
+        for (file, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+            rows.append({"function": f"{Path(file).name}:{line}({function})", "calls": calls,
+                         "seconds": own, "cumulative_seconds": cumulative})
+        return sorted(rows, key=lambda row: row["cumulative_seconds"], reverse=True)[:limit]
+
+    def report(self) -> str:
+        """A plain-text table of the stages, slowest first."""
+        lines = [f"{'stage':<20} {'seconds':>9} {'share':>6} {'rows/s':>14} {'bytes':>12} {'peak mem':>10}"]
+        for name, stats in sorted(self.stages.items(), key=lambda item: item[1].seconds, reverse=True):
+            share = stats.seconds / self.wall_seconds if self.wall_seconds else 0.0
+            rate = f"{stats.rows_per_s:,.0f}" if stats.rows_per_s else "-"
+            memory = format_bytes(stats.peak_memory_bytes)
+            lines.append(f"{name:<20} {stats.seconds:>9.3f} {share:>6.0%} {rate:>14} "
+                         f"{format_bytes(stats.bytes or None):>12} {memory:>10}")
+        lines.append(f"{'total (wall)':<20} {self.wall_seconds:>9.3f}")
+        return "\n".join(lines)
+
+    def summary_line(self, limit: int = 3) -> str:
+        """The slowest stages on one line, for a status bar."""
+        slowest = sorted(self.stages.items(), key=lambda item: item[1].seconds, reverse=True)[:limit]
+        parts = [f"{name} {stats.seconds:.2f} s" for name, stats in slowest]
+        return f"⏱ {self.wall_seconds:.2f} s total" + (" — " + ", ".join(parts) if parts else "")
+
+
+def current() -> Metrics | None:
+    """The collector active in this thread or task, if any."""
+    return _current.get()
+
+
+def stage(name: str, rows: int = 0):
+    """Time a stage on the active collector; a no-op context without one."""
+    metrics = _current.get()
+    return _noop if metrics is None else metrics.stage(name, rows)
+
+
+def record(name: str, seconds: float = 0.0, rows: int = 0, nbytes: int = 0):
+    """Add an already-measured amount to a stage on the active collector."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.add(name, seconds, rows, nbytes, calls=0)
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident memory of this process (``None`` where unavailable, e.g. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    import sys
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def format_bytes(value) -> str:
+    if value is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.1f} {unit}"
+        value /= 1024
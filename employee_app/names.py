@@ -0,0 +1,149 @@
+"""Precomputed Faker name pools for vectorized full-name generation.
+
+``fake.name()`` picks a weighted format such as
+``"{{prefix_male}} {{first_name_male}} {{last_name}}"`` and then a weighted
+element for every token, row by row. Here the formats and every pool they
+reference are extracted once into arrays (with their weights) and cached on
+disk per locale and Faker version, so names for a whole chunk are composed
+with a handful of weighted index draws and array concatenations.
+"""
+from __future__ import annotations
+
+import os
+import re
+from importlib.metadata import version
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+TOKEN_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+# Faker person-provider method -> attribute holding its (weighted) elements
+TOKEN_POOLS = {"first_name": "first_names", "last_name": "last_names", "prefix": "prefixes", "suffix": "suffixes"}
+GENDERS = ("_male", "_female", "_nonbinary")
+
+_pools = {}
+
+
+def get_cache_dir() -> Path:
+    """Directory for on-disk caches (``$EMPLOYEE_APP_CACHE_DIR`` or ``~/.cache/employee_app``)."""
+    path = os.environ.get("EMPLOYEE_APP_CACHE_DIR")
+    return Path(path) if path else Path.home() / ".cache" / "employee_app"
+
+
+def _weighted(elements):
+    """Split Faker elements (a weighted dict or a plain sequence) into values and probabilities."""
+    import numpy as np
+    if isinstance(elements, dict):
+        values = list(elements)
+        weights = np.array(list(elements.values()), dtype=np.float64)
+    else:
+        values = list(elements)
+        weights = np.ones(len(values))
+    return values, weights / weights.sum()
+
+
+def _pool_attribute(person, token: str) -> str:
+    """Map a format token like ``first_name_male`` to the provider attribute holding its elements."""
+    gender = next((g for g in GENDERS if token.endswith(g)), "")
+    base = token[:len(token) - len(gender)]
+    if base not in TOKEN_POOLS:
+        raise ValueError(f"Unsupported name format token: {token!r}")
+    attribute = TOKEN_POOLS[base] + gender
+    # Faker falls back to the ungendered list when a locale has no gendered one
+    if getattr(person, attribute, None) is None:
+        attribute = TOKEN_POOLS[base]
+    return attribute
+
+
+class NamePool:
+    """Weighted name formats plus the value pools their tokens draw from."""
+
+    def __init__(self, formats, format_weights, pools):
+        self.formats = list(formats)
+        self.format_weights = format_weights
+        self.pools = pools  # token -> (object array of values, probabilities)
+        self.pieces = [self._parse(fmt) for fmt in self.formats]
+
+    @staticmethod
+    def _parse(fmt: str):
+        """Split a format into ("text", literal) and ("token", name) pieces."""
+        pieces = []
+        position = 0
+        for match in TOKEN_RE.finditer(fmt):
+            if match.start() > position:
+                pieces.append(("text", fmt[position:match.start()]))
+            pieces.append(("token", match.group(1)))
+            position = match.end()
+        if position < len(fmt):
+            pieces.append(("text", fmt[position:]))
+        return pieces
+
+    @classmethod
+    def from_faker(cls, locale: str) -> NamePool:
+        from faker import Faker
+        person = Faker(locale).provider("faker.providers.person")
+        formats, format_weights = _weighted(person.formats)
+
+        import numpy as np
+        pools = {}
+        for fmt in formats:
+            for token in TOKEN_RE.findall(fmt):
+                if token not in pools:
+                    values, weights = _weighted(getattr(person, _pool_attribute(person, token)))
+                    pools[token] = (np.array(values, dtype=object), weights)
+        return cls(formats, format_weights, pools)
+
+    def save(self, path: Path):
+        import numpy as np
+        arrays = {"formats": np.array(self.formats, dtype=str), "formats__p": self.format_weights}
+        for token, (values, weights) in self.pools.items():
+            arrays[token] = values.astype(str)
+            arrays[f"{token}__p"] = weights
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> NamePool:
+        import numpy as np
+        with np.load(path, allow_pickle=False) as data:
+            pools = {key: (data[key].astype(object), data[f"{key}__p"])
+                     for key in data.files if not key.endswith("__p") and key != "formats"}
+            return cls(data["formats"].tolist(), data["formats__p"], pools)
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """Draw ``n`` full names as an object array, weighted like ``fake.name()``."""
+        import numpy as np
+        names = np.empty(n, dtype=object)
+        format_index = rng.choice(len(self.formats), n, p=self.format_weights)
+        for index, pieces in enumerate(self.pieces):
+            rows = np.flatnonzero(format_index == index)
+            if len(rows) == 0:
+                continue
+            composed = None
+            for kind, value in pieces:
+                if kind == "token":
+                    values, weights = self.pools[value]
+                    value = values[rng.choice(len(values), len(rows), p=weights)]
+                composed = value if composed is None else composed + value
+            names[rows] = composed
+        return names
+
+
+def get_name_pool(locale: str = "en_PH") -> NamePool:
+    """Return the name pool for ``locale``, loading it from the disk cache when possible."""
+    if locale not in _pools:
+        path = get_cache_dir() / f"names-{locale}-faker{version('Faker')}.npz"
+        try:
+            _pools[locale] = NamePool.load(path)
+        except (OSError, ValueError, KeyError):
+            _pools[locale] = NamePool.from_faker(locale)
+            try:
+                _pools[locale].save(path)
+            except OSError:
+                pass  # read-only home etc.; the in-memory pool still works
+    return _pools[locale]
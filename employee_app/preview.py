@@ -0,0 +1,166 @@
+"""Virtualized preview of generated data for the GUI.
+
+``FrameTableModel`` serves cells straight from the frame's column arrays: a
+view only asks for the rows it paints, and rows are handed to it in batches
+of ``FETCH_ROWS`` as it scrolls. Sorting and filtering never copy the frame;
+they compute an index permutation (``argsort`` on the column, a vectorized
+match over the text columns) and map view rows through it.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+FETCH_ROWS = 1_000  # rows added to the view per fetchMore
+
+
+class FrameTableModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frame = None
+        self.columns = []
+        self._numeric = []  # per column: right-align its cells
+        self._order = None  # frame rows in sort order; None = as generated
+        self._index = None  # _order restricted to rows matching the filter
+        self._mask = None  # rows matching the filter; None = no filter
+        self._loaded = 0
+
+    def set_frame(self, frame: pd.DataFrame):
+        self.beginResetModel()
+        self.frame = frame
+        self.columns = [self._cell_reader(frame[name]) for name in frame.columns]
+        self._numeric = [dtype.kind in "iuf" for dtype in frame.dtypes]
+        self._order = None
+        self._index = None
+        self._mask = None
+        self._loaded = min(FETCH_ROWS, len(frame))
+        self.endResetModel()
+
+    @staticmethod
+    def _cell_reader(series: pd.Series):
+        """Return ``row -> display text`` reading from the column's backing array."""
+        import pandas as pd
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, labels = series.cat.codes.to_numpy(), [str(label) for label in series.cat.categories]
+            return lambda row: "" if codes[row] < 0 else labels[codes[row]]
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            values = series.to_numpy(dtype="datetime64[D]")
+            return lambda row: "" if values[row] != values[row] else str(values[row])
+        values = series.array  # Arrow-backed strings stay in Arrow
+        return lambda row: "" if pd.isna(values[row]) else str(values[row])
+
+    def visible_rows(self) -> int:
+        """Rows matching the filter, whether fetched yet or not."""
+        if self.frame is None:
+            return 0
+        return len(self.frame) if self._index is None else len(self._index)
+
+    def frame_row(self, row: int) -> int:
+        return row if self._index is None else int(self._index[row])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self.frame is None else len(self.columns)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < self.visible_rows()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(FETCH_ROWS, self.visible_rows() - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.columns[index.column()](self.frame_row(index.row()))
+        if role == Qt.TextAlignmentRole and self._numeric[index.column()]:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or self.frame is None:
+            return None
+        if orientation == Qt.Horizontal:
+            return str(self.frame.columns[section])
+        return str(self.frame_row(section) + 1)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if self.frame is None:
+            return
+        import numpy as np
+        import pandas as pd
+        if column < 0:  # sort indicator cleared: back to generated order
+            self.layoutAboutToBeChanged.emit()
+            self._order = None
+            self._apply_filter()
+            self.layoutChanged.emit()
+            return
+        series = self.frame.iloc[:, column]
+        if series.dtype.kind in "iufM":
+            keys = series.to_numpy()
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            # Rank the few labels, then look rows up by code (by label, not category order)
+            ranks = np.argsort(np.argsort(series.cat.categories.astype(str)))
+            codes = series.cat.codes.to_numpy()
+            keys = np.where(codes < 0, len(ranks), ranks[codes])  # missing values last
+        else:
+            # Sorting the distinct strings is far cheaper than sorting every row
+            codes, _ = pd.factorize(series, sort=True)
+            keys = np.where(codes < 0, codes.max() + 1, codes)
+        permutation = np.argsort(keys)
+        if order == Qt.DescendingOrder:
+            permutation = permutation[::-1]
+
+        self.layoutAboutToBeChanged.emit()
+        self._order = permutation
+        self._apply_filter()
+        self.layoutChanged.emit()
+
+    def set_filter(self, text: str):
+        """Keep rows where any text column contains ``text`` (case-insensitive)."""
+        if self.frame is None:
+            return
+        self.beginResetModel()
+        text = text.strip()
+        self._mask = self._filter_mask(text) if text else None
+        self._apply_filter()
+        self._loaded = min(FETCH_ROWS, self.visible_rows())
+        self.endResetModel()
+
+    def _apply_filter(self):
+        import numpy as np
+        if self._mask is None:
+            self._index = self._order
+        elif self._order is None:
+            self._index = np.flatnonzero(self._mask)
+        else:
+            self._index = self._order[self._mask[self._order]]
+
+    def _filter_mask(self, text: str) -> np.ndarray:
+        import numpy as np
+        import pandas as pd
+        mask = np.zeros(len(self.frame), dtype=bool)
+        needle = text.lower()
+        for name in self.frame.columns:
+            series = self.frame[name]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Match the few labels once, then select rows by code
+                matches = np.array([needle in str(label).lower() for label in series.cat.categories])
+                codes = series.cat.codes.to_numpy()
+                mask |= (codes >= 0) & matches[codes]
+            elif pd.api.types.is_string_dtype(series.dtype):
+                mask |= series.str.contains(needle, case=False, regex=False).fillna(False).to_numpy(dtype=bool)
+        return mask
@@ -0,0 +1,193 @@
+"""Related tables that share the employee key space.
+
+Besides ``employees`` the generator can produce:
+
+- ``departments``: one row per department, headed by its lowest ``emp_id``
+- ``managers``: the reporting hierarchy, a tree in which every manager has
+  ``FanOut.reports`` direct reports (``manager_id`` is empty for the root)
+- ``salary_history``: ``FanOut.salary_history`` raises per employee, from
+  the hire date up to the current salary
+- ``attendance``: one row per employee for each of the last
+  ``FanOut.attendance_days`` business days since they were hired
+
+Child rows are drawn per employee block from seeds derived from the master
+seed, the block and the table, and the parent columns they need (salary,
+hire date) are regenerated from the block's seed instead of being looked up.
+Any ``emp_id`` range of any table can therefore be generated on its own, in
+any process, and every table is a separate stream: no table is held in memory
+to build another, and the output does not depend on chunk size or workers.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING
+from .generator import (
+    BLOCK_SIZE, DEFAULT_CHUNK_SIZE, DEPARTMENTS, cached_block, generate_employee_block, generate_employee_columns,
+    iter_employee_chunks, iter_id_ranges, resolve_seed,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+TABLES = ("departments", "employees", "managers", "salary_history", "attendance")
+# Spawn-key suffix of each child table's per-block random stream
+TABLE_STREAMS = {"salary_history": 1, "attendance": 2}
+ATTENDANCE_STATUSES = {"Present": 0.85, "Remote": 0.08, "Leave": 0.05, "Absent": 0.02}
+RAISE_MIN = 0.02
+RAISE_MAX = 0.10
+
+
+@dataclass(frozen=True)
+class FanOut:
+    salary_history: int = 3  # rows per employee, the last one being the current salary
+    attendance_days: int = 5  # most recent business days per employee
+    reports: int = 8  # direct reports per manager
+
+    def __post_init__(self):
+        if self.salary_history < 1 or self.attendance_days < 1:
+            raise ValueError("Fan-out must be at least 1 row per employee.")
+        if self.reports < 2:
+            raise ValueError("Managers need at least 2 direct reports.")
+
+
+def iter_related_tables(n: int, seed: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1,
+                        fanout: FanOut = FanOut(), tables=TABLES) -> dict:
+    """Return ``{table: iterator of DataFrame chunks}`` for ``n`` employees.
+
+    All tables share one master seed, so their keys line up. Each iterator is
+    lazy and independent; ``chunk_size`` counts employees, so child-table
+    chunks hold about ``chunk_size`` times the fan-out rows.
+    """
+    if n <= 0:
+        raise ValueError("Number of employees must be positive.")
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive.")
+    unknown = set(tables) - set(TABLES)
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(sorted(unknown))}. Choose from {', '.join(TABLES)}.")
+
+    seed = resolve_seed(seed)
+    streams = {}
+    for table in tables:
+        if table == "employees":
+            streams[table] = iter_employee_chunks(n, chunk_size=chunk_size, seed=seed, workers=workers)
+        elif table == "departments":
+            streams[table] = iter([generate_departments(n, seed)])
+        else:
+            streams[table] = iter_id_ranges(generate_table_range, n, chunk_size, 1, workers, table, seed, fanout)
+    return streams
+
+
+def generate_departments(n: int, seed: int) -> pd.DataFrame:
+    """One row per department; the head is its lowest ``emp_id`` among the first block of employees."""
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0,)))
+    codes = generate_employee_columns(BLOCK_SIZE, rng)["department"][:n]
+    heads = [np.flatnonzero(codes == code) for code in range(len(DEPARTMENTS))]
+    return pd.DataFrame({
+        "department_id": np.arange(1, len(DEPARTMENTS) + 1, dtype=np.int8),
+        "department": pd.Categorical(DEPARTMENTS, categories=DEPARTMENTS),
+        "head_id": pd.array([rows[0] + 1 if len(rows) else None for rows in heads], dtype="Int32"),
+    })
+
+
+def generate_table_range(start_id: int, stop_id: int, table: str, seed: int, fanout: FanOut = FanOut()) -> pd.DataFrame:
+    """Rows of a child ``table`` for the employees with ``start_id <= emp_id < stop_id``."""
+    import numpy as np
+    import pandas as pd
+    if table == "managers":
+        # int32 like emp_id in the employees table, widened past its range rather than wrapping
+        dtype = np.int32 if stop_id - 1 <= np.iinfo(np.int32).max else np.int64
+        return _managers(np.arange(start_id, stop_id, dtype=dtype), fanout.reports)
+
+    parts = []
+    for block in range((start_id - 1) // BLOCK_SIZE, (stop_id - 2) // BLOCK_SIZE + 1):
+        rows = cached_block((table, block, seed, fanout), lambda: _block_rows(table, block, seed, fanout))
+        keep = (rows["emp_id"] >= start_id) & (rows["emp_id"] < stop_id)
+        parts.append({name: values[keep] for name, values in rows.items()})
+
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    if "status" in columns:
+        columns["status"] = pd.Categorical.from_codes(columns["status"], categories=list(ATTENDANCE_STATUSES))
+    for name, values in columns.items():
+        if values.dtype.kind == "M":
+            columns[name] = values.astype("datetime64[s]")
+    return pd.DataFrame(columns)
+
+
+def _block_rows(table: str, block: int, seed: int, fanout: FanOut) -> dict:
+    """Child ``table`` rows for every employee in ``block``, from its parents and its own stream."""
+    import numpy as np
+    parents = generate_employee_block(block, seed)
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block, TABLE_STREAMS[table])))
+    return {"salary_history": _salary_history, "attendance": _attendance}[table](rng, parents, fanout)
+
+
+def _managers(emp_ids: np.ndarray, reports: int) -> pd.DataFrame:
+    """Place ``emp_id`` in a complete tree with ``reports`` children per node, rooted at emp_id 1."""
+    import numpy as np
+    import pandas as pd
+    managers = np.where(emp_ids > 1, (emp_ids - 2) // reports + 1, 0).astype(emp_ids.dtype)
+    levels = np.zeros(len(emp_ids), dtype=np.int8)
+    current = emp_ids.copy()
+    while True:
+        below_root = current > 1
+        if not below_root.any():
+            break
+        levels[below_root] += 1
+        current[below_root] = (current[below_root] - 2) // reports + 1
+    return pd.DataFrame({
+        "emp_id": emp_ids,
+        "manager_id": pd.arrays.IntegerArray(managers, emp_ids <= 1),  # the root has no manager
+        "level": levels,
+    })
+
+
+def _salary_history(rng: np.random.Generator, parents: dict, fanout: FanOut) -> dict:
+    """``fanout.salary_history`` (date, salary) rows per employee, ending at the current salary."""
+    import numpy as np
+    count, steps = len(parents["emp_id"]), fanout.salary_history
+    hired = parents["hire_date"]
+    tenure = (np.datetime64(date.today(), "D") - hired).astype(np.int64)
+    offsets = np.sort(rng.random((count, steps - 1)), axis=1) * tenure[:, None]
+    dates = np.concatenate([hired[:, None], hired[:, None] + offsets.astype("timedelta64[D]")], axis=1)
+
+    # Salary before raise j is the current salary divided by all raises from j on
+    raises = 1 + rng.uniform(RAISE_MIN, RAISE_MAX, (count, steps - 1))
+    remaining = np.cumprod(raises[:, ::-1], axis=1)[:, ::-1]
+    current = parents["salary"].astype(np.float64)[:, None]
+    salaries = np.concatenate([current / remaining, current], axis=1)
+
+    emp_ids = np.repeat(parents["emp_id"], steps)
+    return {
+        "record_id": (emp_ids.astype(np.int64) - 1) * steps + np.tile(np.arange(1, steps + 1), count),
+        "emp_id": emp_ids,
+        "effective_date": dates.ravel(),
+        "salary": np.rint(salaries).astype(np.int32).ravel(),
+    }
+
+
+def _attendance(rng: np.random.Generator, parents: dict, fanout: FanOut) -> dict:
+    """A row per employee and recent business day on or after their hire date."""
+    import numpy as np
+    count, days = len(parents["emp_id"]), fanout.attendance_days
+    offsets = np.arange(days - 1, -1, -1)
+    work_dates = np.busday_offset(np.datetime64(date.today(), "D"), -offsets, roll="backward")
+    weights = np.array(list(ATTENDANCE_STATUSES.values()))
+    status = rng.choice(len(weights), (count, days), p=weights / weights.sum()).astype(np.int8)
+    working = status < 2  # Present or Remote
+    hours = np.where(working, np.round(np.clip(rng.normal(8, 0.75, (count, days)), 4, 12), 2), 0.0)
+
+    emp_ids = np.repeat(parents["emp_id"], days)
+    dates = np.tile(work_dates, count)
+    employed = dates >= np.repeat(parents["hire_date"], days)
+    return {
+        "attendance_id": ((emp_ids.astype(np.int64) - 1) * days + np.tile(np.arange(1, days + 1), count))[employed],
+        "emp_id": emp_ids[employed],
+        "work_date": dates[employed],
+        "status": status.ravel()[employed],
+        "hours": hours.ravel()[employed],
+    }
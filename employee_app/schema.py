@@ -0,0 +1,313 @@
+"""Declarative dataset schemas, compiled once into a vectorized generation plan.
+
+A ``Schema`` is a list of ``Column`` specs. Each column type is drawn for a
+whole block of rows with a couple of array operations, so adding a column
+costs array work rather than per-row Python calls. Schemas can be built in
+Python or loaded from a JSON (or, with PyYAML installed, YAML) file::
+
+    {
+      "name": "employees-banded",
+      "columns": [
+        {"name": "emp_id", "type": "sequence"},
+        {"name": "full_name", "type": "name"},
+        {"name": "department", "type": "category",
+         "values": ["IT", "HR", "Finance"], "weights": [0.5, 0.2, 0.3]},
+        {"name": "salary", "type": "integer", "min": 25000, "max": 120000,
+         "by": "department", "bands": {"IT": [60000, 120000], "HR": [30000, 70000]}},
+        {"name": "hire_date", "type": "date", "start": "2020-01-01", "end": "today"}
+      ]
+    }
+
+Column types:
+
+- ``sequence``: the row id (``emp_id``), consecutive across chunks
+- ``name``: full names from the locale's Faker name pool
+- ``category``: one of ``values``, uniform or by ``weights``
+- ``integer`` / ``float``: ``uniform`` in ``[min, max]`` or ``normal`` with
+  ``mean``/``std`` clipped to ``[min, max]``; ``bands`` maps values of an
+  earlier category column ``by`` to per-value ``[min, max]`` ranges (a
+  normal banded column is centred on each band, so it takes no ``mean``/``std``)
+- ``date``: uniform between ``start`` and ``end`` (ISO date or ``"today"``)
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING
+from .generator import DEPARTMENTS, LOCALE, SALARY_MAX, SALARY_MIN, START_DATE
+from .metrics import stage
+from .names import get_name_pool
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+COLUMN_TYPES = ("sequence", "name", "category", "integer", "float", "date")
+DISTRIBUTIONS = ("uniform", "normal")
+
+_plans = {}
+
+
+@dataclass
+class Column:
+    name: str
+    type: str
+    min: float = None
+    max: float = None
+    distribution: str = "uniform"
+    mean: float = None
+    std: float = None
+    decimals: int = 2
+    values: list = None
+    weights: list = None
+    by: str = None
+    bands: dict = None
+    start: str = None
+    end: str = "today"
+    locale: str = LOCALE
+
+
+@dataclass
+class Schema:
+    columns: list
+    name: str = "custom"
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> Schema:
+        known = {f.name for f in dataclasses.fields(Column)}
+        columns = []
+        for column in spec.get("columns", []):
+            unknown = set(column) - known
+            if unknown:
+                raise ValueError(f"Column {column.get('name')!r} has unknown keys: {', '.join(sorted(unknown))}")
+            columns.append(Column(**column))
+        schema = cls(columns=columns, name=spec.get("name", "custom"))
+        schema.validate()
+        return schema
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+    def fingerprint(self) -> str:
+        """Stable hash of the spec, used to key compiled plans and cached datasets."""
+        return hashlib.sha1(json.dumps(self.to_dict(), sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+    def validate(self):
+        seen = {}
+        for column in self.columns:
+            if column.name in seen:
+                raise ValueError(f"Duplicate column name: {column.name!r}")
+            if column.type not in COLUMN_TYPES:
+                raise ValueError(f"Column {column.name!r}: unknown type {column.type!r}. "
+                                 f"Choose from {', '.join(COLUMN_TYPES)}.")
+            if column.type in ("integer", "float"):
+                if column.distribution not in DISTRIBUTIONS:
+                    raise ValueError(f"Column {column.name!r}: unknown distribution {column.distribution!r}")
+                if column.min is None or column.max is None or column.min > column.max:
+                    raise ValueError(f"Column {column.name!r} needs min <= max")
+                if column.bands:
+                    if column.mean is not None or column.std is not None:
+                        raise ValueError(f"Column {column.name!r}: mean/std cannot be combined with bands; "
+                                         "normal bands are centred on each band")
+                    source = seen.get(column.by)
+                    if source is None or source.type != "category":
+                        raise ValueError(f"Column {column.name!r}: 'by' must name an earlier category column")
+                    unknown = set(column.bands) - set(source.values)
+                    if unknown:
+                        raise ValueError(f"Column {column.name!r}: bands for unknown values {sorted(unknown)}")
+                    for value, band in column.bands.items():
+                        if not isinstance(band, (list, tuple)) or len(band) != 2 or band[0] > band[1]:
+                            raise ValueError(f"Column {column.name!r}: band for {value!r} must be [low, high] "
+                                             "with low <= high")
+            if column.type == "category":
+                if not column.values:
+                    raise ValueError(f"Column {column.name!r} needs values")
+                if column.weights is not None and (len(column.weights) != len(column.values)
+                                                   or min(column.weights) < 0 or sum(column.weights) <= 0):
+                    raise ValueError(f"Column {column.name!r}: weights must match values, be at least 0 "
+                                     "and sum to more than 0")
+            if column.type == "date":
+                if column.start is None:
+                    raise ValueError(f"Column {column.name!r} needs a start date")
+                if _parse_date(column.start) > _parse_date(column.end):
+                    raise ValueError(f"Column {column.name!r}: start date is after end date")
+            seen[column.name] = column
+        if not self.columns:
+            raise ValueError("A schema needs at least one column.")
+
+
+def default_schema() -> Schema:
+    """The built-in employee schema."""
+    return Schema(name="employees", columns=[
+        Column("emp_id", "sequence"),
+        Column("full_name", "name"),
+        Column("department", "category", values=list(DEPARTMENTS)),
+        Column("salary", "integer", min=SALARY_MIN, max=SALARY_MAX),
+        Column("hire_date", "date", start=START_DATE.isoformat()),
+    ])
+
+
+def load_schema(path) -> Schema:
+    """Load a schema from a ``.json``, ``.yaml`` or ``.yml`` file."""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML schemas require PyYAML: pip install pyyaml") from None
+        spec = yaml.safe_load(text)
+    else:
+        spec = json.loads(text)
+    return Schema.from_dict(spec)
+
+
+def _parse_date(value) -> date:
+    if value == "today":
+        return date.today()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def _int_dtype(low, high):
+    import numpy as np
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+
+class GenerationPlan:
+    """A schema compiled into per-column array builders, drawn in column order."""
+
+    def __init__(self, schema: Schema):
+        schema.validate()
+        self.schema = schema
+        self.builders = []  # (name, builder(rng, n, start_id, columns) -> array)
+        self.converters = {}  # name -> raw array to pandas column
+        self.stages = {}  # name -> metrics stage, e.g. "generate.name"
+        for column in schema.columns:
+            getattr(self, f"_compile_{column.type}")(column)
+            self.stages[column.name] = f"generate.{column.type}"
+
+    def columns(self, rng: np.random.Generator, n: int, start_id: int = 1) -> dict:
+        columns = {}
+        for name, build in self.builders:
+            with stage(self.stages[name], n):
+                columns[name] = build(rng, n, start_id, columns)
+        return columns
+
+    def frame(self, columns: dict) -> pd.DataFrame:
+        import pandas as pd
+        with stage("generate.frame", len(next(iter(columns.values())))):
+            return pd.DataFrame({name: self.converters.get(name, _identity)(values)
+                                 for name, values in columns.items()})
+
+    def dtypes(self) -> dict:
+        """pandas dtypes of the frames this plan produces."""
+        import numpy as np
+        import pandas as pd
+        empty = self.columns(np.random.default_rng(0), 0)
+        return dict(self.frame(empty).dtypes)
+
+    def _compile_sequence(self, column: Column):
+        import numpy as np
+        # int32, widened to int64 for ids past its range rather than wrapping
+        self.builders.append((column.name, lambda rng, n, start_id, columns: np.arange(
+            start_id, start_id + n, dtype=np.promote_types(np.int32, _int_dtype(start_id, start_id + n - 1)))))
+
+    def _compile_name(self, column: Column):
+        import pandas as pd
+        pool = get_name_pool(column.locale)
+        self.builders.append((column.name, lambda rng, n, start_id, columns: pool.sample(rng, n)))
+        self.converters[column.name] = lambda values: pd.array(values, dtype="string[pyarrow]")
+
+    def _compile_category(self, column: Column):
+        import numpy as np
+        import pandas as pd
+        count = len(column.values)
+        code_dtype = _int_dtype(0, count)
+        if column.weights is None:
+            build = lambda rng, n, start_id, columns: rng.integers(0, count, n, dtype=code_dtype)  # noqa: E731
+        else:
+            p = np.asarray(column.weights, dtype=np.float64)
+            p = p / p.sum()
+            build = lambda rng, n, start_id, columns: rng.choice(count, n, p=p).astype(code_dtype)  # noqa: E731
+        self.builders.append((column.name, build))
+        dtype = pd.CategoricalDtype(list(column.values))
+        self.converters[column.name] = lambda codes: pd.Categorical.from_codes(codes, dtype=dtype)
+
+    def _numeric_bounds(self, column: Column):
+        """Per-row (low, high) bounds: scalars, or arrays indexed by the ``by`` column's codes."""
+        import numpy as np
+        if not column.bands:
+            return lambda columns: (column.min, column.max)
+        source = next(c for c in self.schema.columns if c.name == column.by)
+        lows = np.array([column.bands.get(value, [column.min, column.max])[0] for value in source.values])
+        highs = np.array([column.bands.get(value, [column.min, column.max])[1] for value in source.values])
+        return lambda columns: (lows[columns[column.by]], highs[columns[column.by]])
+
+    def _draw_numeric(self, column: Column, rng, n: int, low, high, integer: bool):
+        import numpy as np
+        if column.distribution == "normal":
+            mean = column.mean if column.mean is not None else (np.asarray(low) + high) / 2
+            std = column.std if column.std is not None else (np.asarray(high) - low) / 6
+            values = np.clip(rng.normal(mean, std, n), low, high)
+            return np.rint(values) if integer else values
+        if integer:
+            if np.ndim(high) == 0:
+                return rng.integers(int(low), int(high) + 1, n)
+            return rng.integers(low, high + 1, n)
+        return rng.uniform(low, high, n)
+
+    def _compile_integer(self, column: Column):
+        bounds = self._numeric_bounds(column)
+        dtype = _int_dtype(column.min, column.max)
+        if column.bands:
+            band_values = [v for band in column.bands.values() for v in band]
+            dtype = _int_dtype(min(column.min, *band_values), max(column.max, *band_values))
+
+        def build(rng, n, start_id, columns):
+            low, high = bounds(columns)
+            return self._draw_numeric(column, rng, n, low, high, integer=True).astype(dtype)
+        self.builders.append((column.name, build))
+
+    def _compile_float(self, column: Column):
+        import numpy as np
+        bounds = self._numeric_bounds(column)
+
+        def build(rng, n, start_id, columns):
+            low, high = bounds(columns)
+            return np.round(self._draw_numeric(column, rng, n, low, high, integer=False), column.decimals)
+        self.builders.append((column.name, build))
+
+    def _compile_date(self, column: Column):
+        import numpy as np
+        start = _parse_date(column.start)
+
+        def build(rng, n, start_id, columns):
+            # "today" is resolved per draw, like the original generator
+            first = np.datetime64(start, "D")
+            span = (np.datetime64(_parse_date(column.end), "D") - first).astype(np.int64) + 1
+            return first + rng.integers(0, span, n).astype("timedelta64[D]")
+        self.builders.append((column.name, build))
+        self.converters[column.name] = lambda values: values.astype("datetime64[s]")
+
+
+def _identity(values):
+    return values
+
+
+def compile_schema(schema: Schema = None) -> GenerationPlan:
+    """Return the generation plan for ``schema`` (default: the employee schema), compiled once."""
+    schema = schema or default_schema()
+    key = schema.fingerprint()
+    if key not in _plans:
+        _plans[key] = GenerationPlan(schema)
+    return _plans[key]
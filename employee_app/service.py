@@ -0,0 +1,377 @@
+"""Long-running local HTTP service that streams generated employees.
+
+``python -m employee_app.service`` starts an asyncio server on localhost. It
+keeps the Faker name pools and compiled generation plans warm between
+requests, so callers pay for rows rather than for Python, pandas and Faker
+startup::
+
+    GET /employees?count=100000&seed=42&format=ndjson   format: ndjson, csv or arrow;
+                                                        also chunk_size and start_id
+    GET /metrics                                        throughput and per-stage timings (JSON)
+    GET /health
+
+Rows are streamed with chunked transfer encoding. Chunks are generated and
+encoded on a bounded thread pool shared by all requests, and each response
+runs at most one chunk ahead of its socket: a slow reader holds up its own
+generation (backpressure) instead of making the server buffer the response.
+The ``X-Seed`` response header carries the seed, so random requests can be
+reproduced.
+
+Tests and embedding tools can run the service in-process::
+
+    with running_service(port=0) as service:
+        urllib.request.urlopen(f"{service.url}/employees?count=10")
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import ipaddress
+import json
+import os
+import socket
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+from .generator import DEFAULT_CHUNK_SIZE, generate_employee_range, resolve_seed
+from .metrics import Metrics, peak_rss_bytes
+
+DEFAULT_PORT = 8765
+DEFAULT_STREAM_CHUNK = 10_000  # smaller than batch exports: first bytes arrive sooner
+MAX_COUNT = 50_000_000
+MAX_EMP_ID = 2**31 - 1  # the int32 emp_id column every streamed chunk shares
+REQUEST_TIMEOUT = 10.0  # seconds to receive the request headers
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+class _TextEncoder:
+    """NDJSON or CSV bytes for consecutive chunks of one response."""
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.header = True
+
+    def encode(self, chunk) -> bytes:
+        if self.fmt == "csv":
+            text = chunk.to_csv(index=False, header=self.header)
+            self.header = False
+        else:
+            text = chunk.to_json(orient="records", lines=True, date_format="iso")
+        return text.encode("utf-8")
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _ArrowEncoder:
+    """An Arrow IPC stream: the schema with the first chunk, then one record batch per chunk."""
+
+    def __init__(self, fmt: str = "arrow"):
+        self.sink = io.BytesIO()
+        self.writer = None
+
+    def encode(self, chunk) -> bytes:
+        import pyarrow as pa
+        batch = pa.RecordBatch.from_pandas(chunk, preserve_index=False)
+        if self.writer is None:
+            self.writer = pa.ipc.new_stream(self.sink, batch.schema)
+        self.writer.write_batch(batch)
+        return self._take()
+
+    def finish(self) -> bytes:
+        if self.writer is not None:
+            self.writer.close()  # end-of-stream marker
+        return self._take()
+
+    def _take(self) -> bytes:
+        data = self.sink.getvalue()
+        self.sink.seek(0)
+        self.sink.truncate()
+        return data
+
+
+ENCODERS = {"ndjson": _TextEncoder, "csv": _TextEncoder, "arrow": _ArrowEncoder}
+
+
+def _produce(start_id: int, stop_id: int, seed: int, encoder) -> tuple:
+    """Generate and encode one chunk (on a worker thread); return ``(bytes, generate s, encode s)``."""
+    started = time.perf_counter()
+    chunk = generate_employee_range(start_id, stop_id, seed)
+    generated = time.perf_counter()
+    data = encoder.encode(chunk)
+    return data, generated - started, time.perf_counter() - generated
+
+
+def _warm_up():
+    """Load the name pools and compile the default plan before the first request."""
+    generate_employee_range(1, 2, 0)
+
+
+def is_loopback(host: str) -> bool:
+    """Whether every address ``host`` resolves to (IPv4 or IPv6) is a loopback address."""
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)}
+        return bool(addresses) and all(ipaddress.ip_address(address.split("%")[0]).is_loopback
+                                       for address in addresses)
+    except (OSError, ValueError):
+        return False
+
+
+class EmployeeService:
+    """The HTTP service; ``await start()`` binds it, ``await close()`` stops it.
+
+    ``workers`` bounds the generator threads shared by all requests (default:
+    up to 4); ``port=0`` picks a free port, available as ``port`` once started.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, workers: int = None,
+                 max_count: int = MAX_COUNT):
+        if not is_loopback(host):
+            raise ValueError(f"The service only listens on localhost, not {host!r}.")
+        self.host = host
+        self.port = port
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.max_count = max_count
+        self.metrics = Metrics()  # stages are added from the event loop only
+        self.requests = Counter()
+        self.rows = Counter()  # by format
+        self.bytes = 0
+        self.started = None
+        self._executor = None
+        self._slots = None
+        self._server = None
+        self._active = 0
+        self._busy_since = None
+        self._busy_seconds = 0.0
+
+    @property
+    def url(self) -> str:
+        host = f"[{self.host}]" if ":" in self.host else self.host  # IPv6 literal
+        return f"http://{host}:{self.port}"
+
+    async def start(self):
+        from concurrent.futures import ThreadPoolExecutor
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="employee-service")
+        self._slots = asyncio.Semaphore(self.workers)
+        await asyncio.get_running_loop().run_in_executor(self._executor, _warm_up)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.started = time.monotonic()
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def metrics_dict(self) -> dict:
+        """Request counts, rows and bytes served, throughput and per-stage timings."""
+        uptime = time.monotonic() - self.started if self.started is not None else 0.0
+        busy = self._busy_seconds + (time.monotonic() - self._busy_since if self._busy_since is not None else 0.0)
+        rows = sum(self.rows.values())
+        return {
+            "uptime_seconds": uptime,
+            "workers": self.workers,
+            "active_streams": self._active,
+            "requests": dict(self.requests),
+            "rows": rows,
+            "rows_by_format": dict(self.rows),
+            "bytes": self.bytes,
+            "rows_per_s": rows / busy if busy else None,  # while at least one stream was open
+            "stages": {name: {**asdict(stats), "rows_per_s": stats.rows_per_s}
+                       for name, stats in self.metrics.stages.items()},
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+
+    async def _handle(self, reader, writer):
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), REQUEST_TIMEOUT)
+            method, target, _ = head.split(b"\r\n", 1)[0].decode("latin-1").split(" ", 2)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                ConnectionError, ValueError):
+            writer.close()
+            return
+        url = urlsplit(target)
+        try:
+            if method != "GET":
+                await self._send_json(writer, HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Only GET is supported."})
+            elif url.path == "/employees":
+                await self._stream(writer, parse_qs(url.query))
+            elif url.path == "/metrics":
+                await self._send_json(writer, HTTPStatus.OK, self.metrics_dict())
+            elif url.path == "/health":
+                await self._send_json(writer, HTTPStatus.OK, {"status": "ok"})
+            else:
+                await self._send_json(writer, HTTPStatus.NOT_FOUND, {"error": f"No such endpoint: {url.path}"})
+        except ConnectionError:
+            self.requests["aborted"] += 1
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _head(status: HTTPStatus, content_type: str, headers: dict = None) -> bytes:
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Type: {content_type}", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send_json(self, writer, status: HTTPStatus, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(self._head(status, "application/json", {"Content-Length": len(body)}) + body)
+        await writer.drain()
+
+    def _parse(self, params: dict) -> tuple:
+        def number(name, default=None, minimum=1, maximum=None):
+            values = params.get(name)
+            if not values:
+                if default is None:
+                    raise ValueError(f"Missing parameter: {name}")
+                return default
+            try:
+                value = int(values[0])
+            except ValueError:
+                raise ValueError(f"{name} must be a whole number") from None
+            if value < minimum or (maximum is not None and value > maximum):
+                raise ValueError(f"{name} must be between {minimum} and {maximum}" if maximum is not None
+                                 else f"{name} must be at least {minimum}")
+            return value
+
+        fmt = params.get("format", ["ndjson"])[0]
+        if fmt not in CONTENT_TYPES:
+            raise ValueError(f"format must be one of {', '.join(CONTENT_TYPES)}")
+        count = number("count", maximum=self.max_count)
+        chunk_size = number("chunk_size", DEFAULT_STREAM_CHUNK, maximum=DEFAULT_CHUNK_SIZE)
+        start_id = number("start_id", 1, maximum=MAX_EMP_ID)
+        if start_id + count - 1 > MAX_EMP_ID:
+            raise ValueError(f"start_id + count - 1 must be at most {MAX_EMP_ID}")
+        seed = number("seed", minimum=0) if "seed" in params else None
+        return fmt, count, chunk_size, start_id, resolve_seed(seed)
+
+    async def _stream(self, writer, params: dict):
+        try:
+            fmt, count, chunk_size, start_id, seed = self._parse(params)
+        except ValueError as e:
+            self.requests["rejected"] += 1
+            await self._send_json(writer, HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+
+        self.requests["total"] += 1
+        self._stream_opened()
+        encoder = ENCODERS[fmt](fmt)
+        stop_id = start_id + count
+        ranges = [(start, min(start + chunk_size, stop_id)) for start in range(start_id, stop_id, chunk_size)]
+        pending = asyncio.ensure_future(self._produce(*ranges[0], seed, encoder))
+        try:
+            writer.write(self._head(HTTPStatus.OK, CONTENT_TYPES[fmt],
+                                    {"Transfer-Encoding": "chunked", "X-Seed": seed}))
+            for i, (start, stop) in enumerate(ranges):
+                data = await pending
+                # Generate the next chunk while this one drains, but never more than one ahead
+                pending = asyncio.ensure_future(self._produce(*ranges[i + 1], seed, encoder)) \
+                    if i + 1 < len(ranges) else None
+                await self._send_chunk(writer, data, stop - start)
+                self.rows[fmt] += stop - start
+            await self._send_chunk(writer, encoder.finish(), 0)
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+            self.requests["completed"] += 1
+        except ConnectionError:
+            self.requests["aborted"] += 1
+        except Exception:
+            self.requests["failed"] += 1  # headers are out; closing early tells the client
+            raise
+        finally:
+            if pending is not None:
+                pending.cancel()
+            self._stream_closed()
+
+    async def _produce(self, start_id: int, stop_id: int, seed: int, encoder) -> bytes:
+        async with self._slots:  # queue for a worker instead of piling work onto the pool
+            data, generate_seconds, encode_seconds = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _produce, start_id, stop_id, seed, encoder)
+        self.metrics.add("serve.generate", generate_seconds, stop_id - start_id)
+        self.metrics.add("serve.encode", encode_seconds, stop_id - start_id, len(data))
+        return data
+
+    async def _send_chunk(self, writer, data: bytes, rows: int):
+        if not data:
+            return
+        started = time.perf_counter()
+        writer.write(b"%x\r\n%b\r\n" % (len(data), data))
+        await writer.drain()  # waits while the client is not reading
+        self.metrics.add("serve.send", time.perf_counter() - started, rows, len(data))
+        self.bytes += len(data)
+
+    def _stream_opened(self):
+        if self._active == 0:
+            self._busy_since = time.monotonic()
+        self._active += 1
+
+    def _stream_closed(self):
+        self._active -= 1
+        if self._active == 0:
+            self._busy_seconds += time.monotonic() - self._busy_since
+            self._busy_since = None
+
+
+@contextmanager
+def running_service(**options):
+    """Run an ``EmployeeService`` on an event loop in a background thread; yields the started service."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="employee-service-loop", daemon=True)
+    thread.start()
+    service = EmployeeService(**options)
+    try:
+        asyncio.run_coroutine_threadsafe(service.start(), loop).result()
+        yield service
+    finally:
+        asyncio.run_coroutine_threadsafe(service.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, workers: int = None, max_count: int = MAX_COUNT):
+    service = EmployeeService(host, port, workers, max_count)
+    await service.start()
+    print(f"Serving employees on {service.url} with {service.workers} workers", flush=True)
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m employee_app.service",
+                                     description="Serve generated employee data over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="loopback address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=None, help="generator threads shared by all requests")
+    parser.add_argument("--max-count", type=int, default=MAX_COUNT,
+                        help=f"largest count a request may ask for (default: {MAX_COUNT})")
+    args = parser.parse_args(argv)
+    if not is_loopback(args.host):
+        parser.error("--host must be a loopback address")
+    if args.workers is not None and args.workers <= 0:
+        parser.error("--workers must be positive")
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_count))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,204 @@
+"""Sharded export: part files written concurrently, described by a manifest.
+
+Each shard covers a contiguous ``emp_id`` range and is generated and written
+by its own worker process, so no rows cross process boundaries. A run goes
+into a fresh timestamped directory, every part is written under a temporary
+name and renamed into place when complete, and ``_manifest.json`` (shards,
+row counts, SHA-256 checksums and the merged summary) is written last: a run
+directory with a manifest is complete.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+from .exporter import EXPORT_FORMATS, export_data
+from .generator import BLOCK_SIZE, DEFAULT_CHUNK_SIZE, generate_employee_range, resolve_seed
+from .summary import SummaryAccumulator, json_default
+
+if TYPE_CHECKING:
+    from .schema import Schema
+
+MANIFEST_NAME = "_manifest.json"  # underscore: skipped by Parquet dataset readers
+
+
+def create_run_dir(folder_path: str, prefix: str = "export") -> Path:
+    """Create and return a new ``{prefix}-YYYYmmdd-HHMMSS`` directory (suffixed if that exists)."""
+    folder = Path(folder_path)
+    folder.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    for attempt in range(1, 1000):
+        path = folder / (f"{prefix}-{stamp}" if attempt == 1 else f"{prefix}-{stamp}-{attempt}")
+        try:
+            path.mkdir()
+            return path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Could not create a unique run directory in {folder}")
+
+
+def shard_ranges(n: int, shards: int) -> list:
+    """Split ``emp_id`` 1..n into up to ``shards`` contiguous, block-aligned ``(start, stop)`` ranges."""
+    blocks_per_shard = -(-n // (shards * BLOCK_SIZE))
+    size = blocks_per_shard * BLOCK_SIZE
+    return [(start, min(start + size, n + 1)) for start in range(1, n + 1, size)]
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def export_shard(run_dir: Path, part: int, start_id: int, stop_id: int, seed: int, fmt: str,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, schema: Schema = None, options: dict = None) -> tuple:
+    """Generate and write one shard; return ``(manifest entry, SummaryAccumulator)``."""
+    name = f"part-{part:05d}"
+    tmp_dir = run_dir / f".{name}.tmp"
+    tmp_dir.mkdir()
+    try:
+        chunks = (generate_employee_range(start, min(start + chunk_size, stop_id), seed, schema)
+                  for start in range(start_id, stop_id, chunk_size))
+        summary = SummaryAccumulator()
+        tmp_path = export_data(chunks, tmp_dir, fmt, name=name, summary=summary, summary_files=False,
+                               **(options or {}))
+        checksum = file_sha256(tmp_path)
+        file_path = run_dir / tmp_path.name
+        os.replace(tmp_path, file_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    entry = {
+        "file": file_path.name, "start_id": start_id, "stop_id": stop_id, "rows": stop_id - start_id,
+        "bytes": file_path.stat().st_size, "sha256": checksum,
+    }
+    return entry, summary
+
+
+def export_sharded(n: int, folder_path: str, fmt: str = "parquet", shards: int = None, workers: int = None,
+                   seed: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE, schema: Schema = None,
+                   progress=None, **options) -> Path:
+    """Export ``n`` employees as part files in a new run directory; return the manifest path.
+
+    ``shards`` defaults to ``workers``, which defaults to the CPU count.
+    ``progress(done, total)`` is called as shards complete.
+    """
+    if n <= 0:
+        raise ValueError("Number of employees must be positive.")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt!r}. Choose from {', '.join(EXPORT_FORMATS)}.")
+    workers = workers or os.cpu_count() or 1
+    seed = resolve_seed(seed)
+    ranges = shard_ranges(n, shards or workers)
+    run_dir = create_run_dir(folder_path)
+    jobs = [(run_dir, part, start, stop, seed, fmt, chunk_size, schema, options)
+            for part, (start, stop) in enumerate(ranges, start=1)]
+
+    results = _run_shards(jobs, workers, progress)
+    summary = SummaryAccumulator()
+    for part in sorted(results):
+        summary.merge(results[part][1])
+    manifest = {
+        "format": fmt,
+        "rows": n,
+        "seed": seed,
+        "schema": schema.name if schema is not None else "employees",
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "shards": [results[part][0] for part in sorted(results)],
+    }
+    if schema is not None:
+        manifest["schema_definition"] = schema.to_dict()
+    return write_manifest(run_dir, _with_summary(manifest, summary))
+
+
+def append_sharded(manifest_path, n: int, shards: int = 1, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   progress=None, **options) -> Path:
+    """Add ``n`` employees to a sharded run as ``shards`` new part files; return the manifest path.
+
+    The new parts continue the run's ``emp_id`` range with its seed and
+    schema, and the manifest's summary is extended from the new rows only.
+    ``manifest_path`` may also be the run directory.
+    """
+    if n <= 0:
+        raise ValueError("Number of employees must be positive.")
+    manifest_path = Path(manifest_path)
+    if manifest_path.is_dir():
+        manifest_path = manifest_path / MANIFEST_NAME
+    run_dir = manifest_path.parent
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if "summary_state" not in manifest:
+        raise ValueError(f"{manifest_path} has no summary state to extend; re-export the run to append to it.")
+    schema = None
+    if "schema_definition" in manifest:
+        from .schema import Schema
+        schema = Schema.from_dict(manifest["schema_definition"])
+
+    first_part = len(manifest["shards"]) + 1
+    rows = manifest["rows"]
+    jobs = [(run_dir, part, start + rows, stop + rows, manifest["seed"], manifest["format"], chunk_size, schema, options)
+            for part, (start, stop) in enumerate(shard_ranges(n, shards), start=first_part)]
+    results = _run_shards(jobs, workers or min(len(jobs), os.cpu_count() or 1), progress)
+
+    summary = SummaryAccumulator.from_state(manifest["summary_state"])
+    for part in sorted(results):
+        summary.merge(results[part][1])
+    manifest["rows"] = rows + n
+    manifest["shards"] += [results[part][0] for part in sorted(results)]
+    manifest["updated"] = datetime.now().isoformat(timespec="seconds")
+    return write_manifest(run_dir, _with_summary(manifest, summary))
+
+
+def _with_summary(manifest: dict, summary: SummaryAccumulator) -> dict:
+    manifest["summary"] = summary.to_frame().to_dict(orient="records")
+    manifest["hire_years"] = summary.hire_year_frame().to_dict(orient="records")
+    manifest["summary_state"] = summary.to_state()  # lets append_sharded extend the summary
+    return manifest
+
+
+def _run_shards(jobs: list, workers: int, progress=None) -> dict:
+    """Run ``export_shard`` for each job, in a process pool when ``workers > 1``; results by part."""
+    results = {}
+    if workers <= 1 or len(jobs) == 1:
+        for job in jobs:
+            results[job[1]] = export_shard(*job)
+            if progress:
+                progress(len(results), len(jobs))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = {pool.submit(export_shard, *job): job[1] for job in jobs}
+            try:
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    if progress:
+                        progress(len(results), len(jobs))
+            finally:
+                for future in futures:
+                    future.cancel()
+    return results
+
+
+def write_manifest(run_dir: Path, manifest: dict) -> Path:
+    path = run_dir / MANIFEST_NAME
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, default=json_default), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def verify_manifest(manifest_path) -> list:
+    """Return the part files whose size or checksum no longer match ``manifest_path``."""
+    manifest_path = Path(manifest_path)
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    bad = []
+    for shard in manifest["shards"]:
+        path = manifest_path.parent / shard["file"]
+        if not path.exists() or path.stat().st_size != shard["bytes"] or file_sha256(path) != shard["sha256"]:
+            bad.append(shard["file"])
+    return bad
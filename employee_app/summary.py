@@ -0,0 +1,238 @@
+"""Streaming Summary aggregation.
+
+``SummaryAccumulator`` is fed one chunk at a time and keeps only
+per-department running statistics, a small quantile sketch per department
+and hire-year counts. Memory depends on the number of departments, not on
+the number of rows, and no second pass over the data is needed.
+
+Custom schemas may lack some of the employee columns; statistics that need a
+missing column are simply not collected.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING
+from .metrics import stage
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+PERCENTILES = (0.25, 0.5, 0.75, 0.9)
+
+
+class QuantileSketch:
+    """Mergeable KLL-style quantile sketch.
+
+    Items live in levels of sorted compactors; an item on level ``h`` stands
+    for ``2 ** h`` inputs. A level holding more than ``k`` items is sorted and
+    every other item (from a random offset) is promoted to the next level, so
+    the sketch keeps ``O(k log(n / k))`` items and rank error shrinks with ``k``.
+    """
+
+    def __init__(self, k: int = 1024, seed: int = 0):
+        import numpy as np
+        self.k = k
+        self.levels = []
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        import numpy as np
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self._add(0, values)
+
+    def merge(self, other: QuantileSketch):
+        self.count += other.count
+        for level, items in enumerate(other.levels):
+            self._add(level, items)
+
+    def _add(self, level: int, items: np.ndarray):
+        import numpy as np
+        while True:
+            if level == len(self.levels):
+                self.levels.append(items)
+            else:
+                self.levels[level] = np.concatenate([self.levels[level], items])
+            if len(self.levels[level]) <= self.k:
+                return
+            ordered = np.sort(self.levels[level])
+            # An odd item out stays behind so total weight is preserved exactly
+            keep = ordered[:1] if len(ordered) % 2 else ordered[:0]
+            ordered = ordered[len(keep):]
+            self.levels[level] = keep
+            items = ordered[self._rng.integers(0, 2)::2]
+            level += 1
+
+    def to_state(self) -> dict:
+        """JSON-serializable state; ``from_state`` restores an identical sketch."""
+        return {"k": self.k, "count": self.count, "levels": [level.tolist() for level in self.levels],
+                "rng": self._rng.bit_generator.state}
+
+    @classmethod
+    def from_state(cls, state: dict) -> QuantileSketch:
+        import numpy as np
+        sketch = cls(state["k"])
+        sketch.count = state["count"]
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in state["levels"]]
+        sketch._rng.bit_generator.state = state["rng"]
+        return sketch
+
+    def quantiles(self, qs) -> list:
+        import numpy as np
+        if self.count == 0:
+            return [float("nan")] * len(qs)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, ranks, side="left"), len(items) - 1)
+        return items[positions].tolist()
+
+
+class DepartmentStats:
+    """Running count, sum, min, max, mean and variance (Chan et al. merge) for one department."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.sketch = QuantileSketch()
+
+    def merge_batch(self, count: int, total, minimum, maximum, mean: float, m2: float):
+        combined = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / combined
+        self.m2 += m2 + delta * delta * self.count * count / combined
+        self.count = combined
+        self.total += total
+        self.minimum = minimum if self.minimum is None else min(self.minimum, minimum)
+        self.maximum = maximum if self.maximum is None else max(self.maximum, maximum)
+
+    def to_state(self) -> dict:
+        return {"count": self.count, "total": self.total, "minimum": self.minimum, "maximum": self.maximum,
+                "mean": self.mean, "m2": self.m2, "sketch": self.sketch.to_state()}
+
+    @classmethod
+    def from_state(cls, state: dict) -> DepartmentStats:
+        stats = cls()
+        for name in ("count", "total", "minimum", "maximum", "mean", "m2"):
+            setattr(stats, name, state[name])
+        stats.sketch = QuantileSketch.from_state(state["sketch"])
+        return stats
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+class SummaryAccumulator:
+    """Per-department salary statistics and hire-year counts, updated one chunk at a time."""
+
+    def __init__(self):
+        self.departments = {}  # name -> DepartmentStats
+        self.hire_years = Counter()  # (department, year) -> employees
+        self.rows = 0
+
+    def update(self, chunk: pd.DataFrame):
+        self.rows += len(chunk)
+        if len(chunk) == 0 or "department" not in chunk:
+            return
+        with stage("summary", len(chunk)):
+            if "salary" in chunk:
+                self._update_salaries(chunk)
+            if "hire_date" in chunk:
+                self._update_hire_years(chunk)
+
+    def _update_salaries(self, chunk: pd.DataFrame):
+        salaries = chunk.groupby("department", observed=True)["salary"]
+        batch = salaries.agg(size="count", total="sum", low="min", high="max", mean="mean")
+        batch["m2"] = salaries.var(ddof=0) * batch["size"]
+        for row in batch.itertuples():
+            stats = self.departments.setdefault(str(row.Index), DepartmentStats())
+            stats.merge_batch(row.size, row.total, row.low, row.high, row.mean, row.m2)
+        for department, values in salaries:
+            self.departments[str(department)].sketch.update(values.to_numpy())
+
+    def _update_hire_years(self, chunk: pd.DataFrame):
+        import pandas as pd
+        hire_dates = chunk["hire_date"]
+        if not pd.api.types.is_datetime64_any_dtype(hire_dates.dtype):
+            hire_dates = pd.to_datetime(hire_dates)
+        years = chunk.groupby(["department", hire_dates.dt.year], observed=True).size()
+        for (department, year), count in years.items():
+            self.hire_years[(str(department), int(year))] += int(count)
+
+    def merge(self, other: SummaryAccumulator):
+        """Fold another accumulator (e.g. from a parallel shard) into this one."""
+        self.rows += other.rows
+        for department, theirs in other.departments.items():
+            ours = self.departments.setdefault(department, DepartmentStats())
+            ours.merge_batch(theirs.count, theirs.total, theirs.minimum, theirs.maximum, theirs.mean, theirs.m2)
+            ours.sketch.merge(theirs.sketch)
+        self.hire_years.update(other.hire_years)
+
+    def to_state(self) -> dict:
+        """JSON-serializable state, so a dataset's summary can be extended later without a rescan."""
+        return {
+            "rows": self.rows,
+            "departments": {name: stats.to_state() for name, stats in self.departments.items()},
+            "hire_years": [[department, year, count] for (department, year), count in self.hire_years.items()],
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> SummaryAccumulator:
+        summary = cls()
+        summary.rows = state["rows"]
+        summary.departments = {name: DepartmentStats.from_state(stats) for name, stats in state["departments"].items()}
+        summary.hire_years.update({(department, year): count for department, year, count in state["hire_years"]})
+        return summary
+
+    def to_frame(self) -> pd.DataFrame:
+        import pandas as pd
+        if not self.rows:
+            raise ValueError("No employee data to export.")
+        if not self.departments:
+            return pd.DataFrame(columns=["Department", "Employees"])
+        rows = []
+        for department in sorted(self.departments):
+            stats = self.departments[department]
+            row = {
+                "Department": department,
+                "Average Salary": stats.mean,
+                "Employees": stats.count,
+                "Total Salary": stats.total,
+                "Min Salary": stats.minimum,
+                "Max Salary": stats.maximum,
+                "Salary Std Dev": stats.variance ** 0.5,
+            }
+            for q, value in zip(PERCENTILES, stats.sketch.quantiles(PERCENTILES)):
+                row[f"P{round(q * 100)} Salary"] = value
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def hire_year_frame(self) -> pd.DataFrame:
+        """Employees hired per year (rows) and department (columns), with a Total column."""
+        import pandas as pd
+        counts = pd.Series(self.hire_years, dtype="int64")
+        if counts.empty:
+            return pd.DataFrame(columns=["Hire Year", "Total"])
+        table = counts.unstack(level=0, fill_value=0).sort_index()
+        table = table[sorted(table.columns)]
+        table["Total"] = table.sum(axis=1)
+        table.index.name = "Hire Year"
+        return table.reset_index()
+
+
+def json_default(value):
+    """``json.dumps`` fallback for summary tables: NumPy scalars as Python numbers, anything else as text."""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
@@ -0,0 +1,79 @@
+import sqlite3
+import sys
+import tempfile
+import pandas as pd
+import pytest
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from employee_app.append import (append_dataset, append_to_database, export_dataset, load_dataset, read_state,
+                                 state_path)
+from employee_app.cli import main
+from employee_app.exporter import export_data
+from employee_app.generator import generate_employee_data
+from employee_app.snapshot import Snapshot
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_append_matches_generating_the_larger_dataset(fmt):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        grown, whole = Path(tmpdir) / "grown", Path(tmpdir) / "whole"
+        export_dataset(10_000, grown, fmt, seed=5, chunk_size=2_500)
+        file_path = append_dataset(500, grown, fmt, chunk_size=2_500)
+        export_dataset(10_500, whole, fmt, seed=5, chunk_size=2_500)
+
+        for name in (f"employees.{fmt}", f"employees_summary.{fmt}", f"employees_hire_years.{fmt}"):
+            assert (grown / name).read_bytes() == (whole / name).read_bytes()
+        assert read_state(file_path).rows == 10_500
+
+def test_snapshot_append_adds_a_block():
+    df = generate_employee_data(1_300, vectorized=True, seed=2)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        export_dataset(1_000, tmpdir, "snapshot", seed=2)
+        file_path = append_dataset(300, tmpdir, "snapshot")
+        snapshot = Snapshot(file_path)
+        assert len(snapshot.index["blocks"]) == 2
+        pd.testing.assert_frame_equal(snapshot.to_frame(), df)
+        assert [len(chunk) for chunk in snapshot.iter_chunks()] == [1_000, 300]
+        assert sum(row["Employees"] for row in snapshot.index["summary"]) == 1_300
+        del snapshot
+
+def test_database_append_continues_ids():
+    df = generate_employee_data(900, vectorized=True, seed=4)
+    connection = sqlite3.connect(":memory:")
+    assert load_dataset(600, connection, seed=4, batch_size=250) == 600
+    assert append_to_database(300, connection) == 300
+    loaded = pd.read_sql("SELECT emp_id, full_name FROM employees ORDER BY emp_id", connection)
+    assert loaded["full_name"].tolist() == df["full_name"].tolist()
+
+def test_append_requires_saved_state():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        export_dataset(100, tmpdir, "csv", seed=1)
+        state_path(Path(tmpdir) / "employees.csv").unlink()
+        with pytest.raises(ValueError, match="no saved dataset state"):
+            append_dataset(10, tmpdir, "csv")
+        with pytest.raises(ValueError, match="Cannot append"):
+            append_dataset(10, tmpdir, "xlsx")
+
+def test_reexport_or_edit_invalidates_saved_state():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = export_dataset(100, tmpdir, "csv", seed=1)
+        export_data(generate_employee_data(50, vectorized=True, seed=2), tmpdir, "csv")
+        assert not state_path(file_path).exists()
+        with pytest.raises(ValueError, match="no saved dataset state"):
+            append_dataset(10, tmpdir, "csv")
+
+        export_dataset(100, tmpdir, "jsonl", seed=1)
+        jsonl_path = Path(tmpdir) / "employees.jsonl"
+        jsonl_path.write_text("".join(jsonl_path.read_text().splitlines(keepends=True)[:60]))
+        with pytest.raises(ValueError, match="has 60 rows but its saved state describes 100"):
+            append_dataset(10, tmpdir, "jsonl")
+
+def test_cli_appends_to_previous_export(capsys):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assert main(["--count", "400", "--seed", "3", "--format", "csv", "--quiet", "--output", tmpdir]) == 0
+        assert main(["--count", "100", "--format", "csv", "--quiet", "--output", tmpdir, "--append"]) == 0
+        file_path = Path(capsys.readouterr().out.split()[-1])
+        expected = generate_employee_data(500, vectorized=True, seed=3)
+        assert pd.read_csv(file_path)["full_name"].tolist() == expected["full_name"].tolist()
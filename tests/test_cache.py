@@ -0,0 +1,37 @@
+import sys
+import pandas as pd
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from employee_app.cache import DatasetCache
+from employee_app.generator import generate_employee_data
+
+def test_cache_serves_prefix_of_larger_dataset(tmp_path):
+    cache = DatasetCache(tmp_path)
+    first = pd.concat(cache.chunks(30_000, seed=11, chunk_size=10_000), ignore_index=True)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    smaller = cache.load(12_345, seed=11)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert smaller.equals(first.iloc[:12_345])
+    assert smaller.equals(generate_employee_data(12_345, vectorized=True, seed=11))
+
+def test_cache_replaces_prefixes_and_evicts_by_size(tmp_path):
+    cache = DatasetCache(tmp_path)
+    cache.load(1_000, seed=1)
+    cache.load(5_000, seed=1)
+    assert len(list(tmp_path.glob("*.arrow"))) == 1
+
+    cache.max_bytes = cache.size_bytes()
+    cache.load(5_000, seed=2)
+    remaining = list(tmp_path.glob("*.arrow"))
+    assert len(remaining) == 1 and cache.key(2) in remaining[0].name
+
+def test_unfinished_stream_is_not_cached(tmp_path):
+    cache = DatasetCache(tmp_path)
+    chunks = cache.chunks(30_000, seed=3, chunk_size=10_000)
+    next(chunks)
+    chunks.close()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+import tempfile
+import pandas as pd
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from employee_app.cli import main
+
+ROOT = Path(__file__).parent.parent
+
+def test_cli_exports_requested_count(capsys):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assert main(["--count", "1234", "--seed", "5", "--format", "csv", "--chunk-size", "500", "--output", tmpdir]) == 0
+        file_path = Path(capsys.readouterr().out.strip())
+        assert pd.read_csv(file_path)["emp_id"].tolist() == list(range(1, 1235))
+
+def test_cli_does_not_import_qt():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        code = (
+            "import sys; from employee_app.cli import main; "
+            f"main(['--count', '10', '--format', 'csv', '--quiet', '--output', {tmpdir!r}]); "
+            "assert not any(name.startswith('PySide6') for name in sys.modules)"
+        )
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True)
+
+def test_cli_exports_related_tables(capsys):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assert main(["--count", "40", "--seed", "2", "--format", "csv", "--quiet", "--output", tmpdir,
+                     "--tables", "employees", "salary_history", "--salary-history", "2"]) == 0
+        paths = [Path(line) for line in capsys.readouterr().out.split()]
+        assert [path.name for path in paths] == ["employees.csv", "salary_history.csv"]
+        assert len(pd.read_csv(paths[1])) == 80
+
+def test_cli_sharded_export_writes_manifest(capsys):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assert main(["--count", "30000", "--seed", "1", "--format", "csv", "--quiet", "--output", tmpdir,
+                     "--shards", "3", "--workers", "1"]) == 0
+        manifest = json.loads(Path(capsys.readouterr().out.strip()).read_text())
+        assert sum(shard["rows"] for shard in manifest["shards"]) == 30000
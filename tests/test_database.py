@@ -0,0 +1,91 @@
+import sqlite3
+import sys
+import tempfile
+import pandas as pd
+import pytest
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from employee_app.cli import main
+from employee_app.database import load_into_database
+from employee_app.exporter import export_data, export_tables
+from employee_app.generator import generate_employee_data, generate_employee_range, iter_employee_chunks
+from employee_app.relations import generate_table_range, iter_related_tables
+
+def test_load_into_database_batches_rows_and_defers_indexes():
+    df = generate_employee_data(2_500, vectorized=True, seed=3)
+    connection = sqlite3.connect(":memory:")
+    assert load_into_database(iter_employee_chunks(2_500, chunk_size=1_000, seed=3), connection, batch_size=300) == 2_500
+
+    loaded = pd.read_sql("SELECT * FROM employees ORDER BY emp_id", connection)
+    assert loaded["emp_id"].tolist() == df["emp_id"].tolist()
+    assert loaded["full_name"].tolist() == df["full_name"].tolist()
+    assert loaded["hire_date"].tolist() == df["hire_date"].dt.strftime("%Y-%m-%d").tolist()
+    indexes = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert indexes == {"employees_emp_id_key", "employees_department_idx"}
+
+    with pytest.raises(sqlite3.DatabaseError):
+        load_into_database(df, connection)
+    with pytest.raises(sqlite3.IntegrityError):  # the unique emp_id index still applies to appends
+        load_into_database(df.head(10), connection, create_table=False)
+    assert connection.execute("SELECT COUNT(*) FROM employees").fetchone()[0] == 2_500
+    assert load_into_database(generate_employee_range(2_501, 2_511, 3), connection, create_table=False) == 10
+    assert connection.execute("SELECT MAX(emp_id) FROM employees").fetchone()[0] == 2_510
+    assert load_into_database(df.head(10), connection, replace=True) == 10
+
+def test_load_into_database_stores_missing_values_as_null():
+    managers = generate_table_range(1, 200, "managers", 4)
+    connection = sqlite3.connect(":memory:")
+    load_into_database(managers, connection, table="managers")
+    nulls = connection.execute("SELECT COUNT(*) FROM managers WHERE manager_id IS NULL").fetchone()[0]
+    assert nulls == managers["manager_id"].isna().sum() > 0
+
+def test_sqlite_export_writes_summary_tables():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = export_data(iter_employee_chunks(1_500, chunk_size=500, seed=6), tmpdir, "sqlite", batch_size=400)
+        assert file_path.name == "employees.sqlite"
+        connection = sqlite3.connect(file_path)
+        try:
+            summary = pd.read_sql("SELECT * FROM employees_summary", connection)
+            assert summary["Employees"].sum() == 1_500
+            assert connection.execute("SELECT COUNT(*) FROM employees_hire_years").fetchone()[0] > 0
+        finally:
+            connection.close()
+
+def test_sqlite_export_keys_child_tables_by_plain_emp_id_index():
+    tables = ("employees", "managers", "salary_history", "attendance")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = export_tables(iter_related_tables(100, seed=1, chunk_size=40, tables=tables), tmpdir, "sqlite")
+        for name in tables:
+            connection = sqlite3.connect(paths[name])
+            try:
+                indexes = {row[0] for row in connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (name,))}
+                rows = connection.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+            finally:
+                connection.close()
+            if name == "employees":
+                assert indexes == {"employees_emp_id_key", "employees_department_idx"}
+                assert rows == 100
+            else:
+                assert indexes == {f"{name}_emp_id_idx"}
+                assert rows >= 100
+
+def test_cli_loads_into_database(capsys):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = str(Path(tmpdir) / "load.db")
+        arguments = ["--count", "700", "--seed", "2", "--quiet", "--database", database, "--table", "staff"]
+        assert main(arguments + ["--batch-size", "100"]) == 0
+        assert main(["--count", "300", "--seed", "2", "--quiet", "--database", database, "--table", "temp"]) == 0
+        assert "700 rows loaded into staff" in capsys.readouterr().out
+        assert main(["--count", "50", "--quiet", "--database", database, "--table", "staff"]) == 2
+        assert "--append" in capsys.readouterr().err
+        assert main(["--count", "50", "--seed", "5", "--quiet", "--database", database, "--table", "temp", "--replace"]) == 0
+        connection = sqlite3.connect(database)
+        try:
+            assert connection.execute("SELECT COUNT(*) FROM staff").fetchone()[0] == 700
+            assert connection.execute("SELECT COUNT(*) FROM temp").fetchone()[0] == 50
+        finally:
+            connection.close()
@@ -1,4 +1,5 @@
 import tempfile
+import pytest
 import pandas as pd
 import sys
 from pathlib import Path
@@ -6,7 +7,9 @@ from pathlib import Path
 # Add the parent directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from employee_app.exporter import export_to_excel
+from employee_app.exporter import export_data, export_to_excel
+from employee_app.generator import generate_employee_data, iter_employee_chunks
+from employee_app.summary import SummaryAccumulator
 
 def test_export_to_excel():
     df = pd.DataFrame({
@@ -19,4 +22,55 @@ def test_export_to_excel():
 
     with tempfile.TemporaryDirectory() as tmpdir:
         file_path = export_to_excel(df, tmpdir)
-        assert file_path.exists()
\ No newline at end of file
+        assert file_path.exists()
+
+def test_export_to_excel_from_chunks():
+    chunks = iter_employee_chunks(25, chunk_size=10, seed=1)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = export_to_excel(chunks, tmpdir)
+        employees = pd.read_excel(file_path, sheet_name="Employees")
+        assert employees["emp_id"].tolist() == list(range(1, 26))
+
+def test_export_to_excel_rolls_over_sheets():
+    df = generate_employee_data(25, vectorized=True, seed=2)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = export_to_excel(iter_employee_chunks(25, chunk_size=8, seed=2), tmpdir, max_rows_per_sheet=10)
+        sheets = pd.read_excel(file_path, sheet_name=None)
+        assert list(sheets) == ["Employees", "Employees_2", "Employees_3", "Summary"]
+        assert [len(sheets[name]) for name in list(sheets)[:3]] == [10, 10, 5]
+
+        summary = pd.read_excel(file_path, sheet_name="Summary", skiprows=2, nrows=df["department"].nunique())
+        expected = df.groupby("department", observed=True)["salary"].mean()
+        assert summary.set_index("Department")["Average Salary"].to_dict() == pytest.approx(expected.to_dict())
+
+@pytest.mark.parametrize("fmt, read", [
+    ("parquet", pd.read_parquet),
+    ("feather", pd.read_feather),
+    ("csv", pd.read_csv),
+    ("jsonl", lambda path: pd.read_json(path, lines=True)),
+])
+def test_export_data_formats(fmt, read):
+    df = generate_employee_data(25, vectorized=True, seed=4)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = export_data(iter_employee_chunks(25, chunk_size=10, seed=4), tmpdir, fmt)
+        exported = read(file_path)
+        assert exported["emp_id"].tolist() == df["emp_id"].tolist()
+        assert exported["full_name"].tolist() == df["full_name"].tolist()
+
+        summary = read(file_path.with_name(f"employees_summary{file_path.suffix}"))
+        assert summary["Department"].tolist() == sorted(df["department"].unique())
+
+def test_export_data_fills_caller_summary_and_writes_summary_files():
+    summary = SummaryAccumulator()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = export_data(iter_employee_chunks(1_200, chunk_size=500, seed=5), tmpdir, "csv", summary=summary)
+        assert summary.rows == 1_200  # each chunk is summarized once
+        written = pd.read_csv(file_path.with_name("employees_summary.csv"))
+        assert written["Employees"].sum() == 1_200
+
+        shard = export_data(generate_employee_data(50, vectorized=True, seed=5), tmpdir, "csv", name="part",
+                            summary=SummaryAccumulator(), summary_files=False)
+        assert not shard.with_name("part_summary.csv").exists()
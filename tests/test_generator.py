@@ -1,12 +1,61 @@
+from datetime import date
 import sys
+import pandas as pd
 from pathlib import Path
 
 # Add the parent directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from employee_app.generator import generate_employee_data
+from employee_app import generator
+from employee_app.generator import (
+    DEPARTMENTS, generate_employee_data, generate_employee_data_parallel, iter_employee_chunks
+)
 
 def test_generate_employee_data():
     df = generate_employee_data(5)
     assert len(df) == 5
-    assert set(["emp_id", "full_name", "department", "salary", "hire_date"]).issubset(df.columns)
\ No newline at end of file
+    assert set(["emp_id", "full_name", "department", "salary", "hire_date"]).issubset(df.columns)
+
+def test_generate_employee_data_vectorized():
+    df = generate_employee_data(1000, vectorized=True, seed=42)
+    assert len(df) == 1000
+    assert list(df.columns) == ["emp_id", "full_name", "department", "salary", "hire_date"]
+    assert df["emp_id"].tolist() == list(range(1, 1001))
+    assert set(df["department"]).issubset(DEPARTMENTS)
+    assert df["salary"].between(25000, 120000).all()
+    assert df["hire_date"].min() >= pd.Timestamp(2020, 1, 1)
+    assert df["hire_date"].max() <= pd.Timestamp(date.today())
+    assert df.equals(generate_employee_data(1000, vectorized=True, seed=42))
+
+def test_iter_employee_chunks():
+    chunks = list(iter_employee_chunks(25, chunk_size=10, seed=7))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert pd.concat(chunks)["emp_id"].tolist() == list(range(1, 26))
+
+def test_seeded_generation_is_identical_across_modes():
+    expected = generate_employee_data(25000, vectorized=True, seed=3)
+    chunked = pd.concat(iter_employee_chunks(25000, chunk_size=7777, seed=3), ignore_index=True)
+    parallel = generate_employee_data_parallel(25000, workers=2, seed=3)
+    assert chunked.equals(expected)
+    assert parallel.equals(expected)
+
+def test_generated_frames_use_compact_schema():
+    vectorized = generate_employee_data(100, vectorized=True, seed=8)
+    rows = generate_employee_data(5, seed=8)
+    for df in (vectorized, rows):
+        assert df["emp_id"].dtype == "int32"
+        assert df["salary"].dtype == "int32"
+        assert isinstance(df["department"].dtype, pd.CategoricalDtype)
+        assert list(df["department"].cat.categories) == DEPARTMENTS
+        assert df["full_name"].dtype == "string[pyarrow]"
+        assert df["hire_date"].dtype == "datetime64[s]"
+
+def test_small_chunks_draw_each_block_once(monkeypatch):
+    drawn = []
+    draw = generator.generate_employee_columns
+    monkeypatch.setattr(generator, "generate_employee_columns", lambda n, rng, start_id=1, schema=None:
+                        drawn.append(start_id) or draw(n, rng, start_id, schema))
+    chunks = list(iter_employee_chunks(25_000, chunk_size=700, seed=17, start_id=5_001))
+    assert drawn == [1, 10_001, 20_001]
+    expected = generate_employee_data(30_000, vectorized=True, seed=17).iloc[5_000:].reset_index(drop=True)
+    assert pd.concat(chunks, ignore_index=True).equals(expected)
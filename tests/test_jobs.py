@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+import pandas as pd
+import pytest
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("PySide6")
+
+from employee_app.generator import generate_employee_data
+from employee_app.jobs import Job, export_job, generate_job
+
+def test_generate_job_reports_progress():
+    job = Job(generate_job, 250_000)
+    progress, results = [], []
+    job.signals.progress.connect(progress.append)
+    job.signals.finished.connect(results.append)
+    job.run()
+    assert progress == [100_000, 200_000, 250_000]
+    assert len(results[0]) == 250_000
+
+def test_generated_data_is_spooled_to_a_mapped_snapshot():
+    with tempfile.TemporaryDirectory() as spool_dir:
+        results = []
+        job = Job(generate_job, 25_000, 6, None, None, spool_dir)
+        job.signals.finished.connect(results.append)
+        job.run()
+        pd.testing.assert_frame_equal(results[0], generate_employee_data(25_000, vectorized=True, seed=6))
+        assert not results[0]["salary"].to_numpy().flags.owndata  # a view of the mapped file
+        if os.name == "posix":
+            assert not list(Path(spool_dir).iterdir())  # unlinked once mapped
+
+        job = Job(generate_job, 250_000, 6, None, None, spool_dir)
+        job.signals.progress.connect(lambda rows: job.cancel())
+        job.run()
+        if os.name == "posix":
+            assert not list(Path(spool_dir).iterdir())
+
+def test_cancelled_job_stops():
+    job = Job(generate_job, 250_000)
+    cancelled, results = [], []
+    job.signals.cancelled.connect(lambda: cancelled.append(True))
+    job.signals.finished.connect(results.append)
+    job.cancel()
+    job.run()
+    assert cancelled == [True]
+    assert results == []
+
+def test_cancelled_export_keeps_previous_file():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        stale_state = Path(tmpdir) / "employees.csv.state.json"
+        stale_state.write_text("{}")
+        Job(export_job, generate_employee_data(30_000, vectorized=True, seed=1), tmpdir, "csv").run()
+        assert not stale_state.exists()
+        files = {path.name: path.read_bytes() for path in Path(tmpdir).iterdir()}
+        assert "employees.csv" in files and "employees_summary.csv" in files
+
+        job = Job(export_job, generate_employee_data(100_000, vectorized=True, seed=2), tmpdir, "csv")
+        cancelled = []
+        job.signals.progress.connect(lambda rows: job.cancel())
+        job.signals.cancelled.connect(lambda: cancelled.append(True))
+        job.run()
+        assert cancelled == [True]
+        assert {path.name: path.read_bytes() for path in Path(tmpdir).iterdir()} == files
+        assert len(pd.read_csv(Path(tmpdir) / "employees.csv")) == 30_000
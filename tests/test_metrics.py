@@ -0,0 +1,53 @@
+import json
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from employee_app.exporter import export_data
+from employee_app.generator import iter_employee_chunks
+from employee_app.metrics import Metrics, current, stage
+
+def test_stages_are_recorded_across_generation_and_export():
+    seen = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with Metrics(callback=lambda name, stats: seen.append(name)) as metrics:
+            file_path = export_data(iter_employee_chunks(30_000, chunk_size=10_000, seed=1), tmpdir, "csv")
+
+        stages = metrics.stages
+        assert stages["generate.name"].rows == 30_000
+        assert stages["export.write"].rows == 30_000 and stages["export.write"].calls == 3
+        assert stages["export.write"].bytes == file_path.stat().st_size
+        assert stages["summary"].rows == 30_000
+        assert sum(stats.seconds for stats in stages.values()) <= metrics.wall_seconds
+        assert "export.write" in seen
+
+        metrics.dump(Path(tmpdir) / "metrics.json")
+        dumped = json.loads((Path(tmpdir) / "metrics.json").read_text())
+        assert dumped["stages"]["export.write"]["rows_per_s"] > 0
+        assert "export.write" in metrics.report()
+
+def test_stage_is_a_noop_without_a_collector_and_per_thread():
+    with stage("anything", rows=5):
+        pass
+    assert current() is None
+
+    other = []
+    with Metrics() as metrics:
+        thread = threading.Thread(target=lambda: other.append(current()))
+        thread.start()
+        thread.join()
+        with stage("mine", rows=5):
+            pass
+    assert other == [None]
+    assert metrics.stages["mine"].rows == 5
+
+def test_profile_and_memory_capture():
+    with Metrics(profile=True, trace_memory=True) as metrics:
+        for _ in iter_employee_chunks(5_000, seed=2):
+            pass
+    assert metrics.stages["generate.name"].peak_memory_bytes > 0
+    assert any("generate_employee_range" in row["function"] for row in metrics.top_functions(50))
@@ -0,0 +1,32 @@
+import sys
+import numpy as np
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from employee_app import names
+from employee_app.names import NamePool, get_name_pool
+
+def test_name_pool_cache_roundtrip(tmp_path):
+    pool = NamePool.from_faker("en_PH")
+    pool.save(tmp_path / "names.npz")
+    loaded = NamePool.load(tmp_path / "names.npz")
+
+    assert loaded.formats == pool.formats
+    first = pool.sample(np.random.default_rng(1), 1000)
+    assert loaded.sample(np.random.default_rng(1), 1000).tolist() == first.tolist()
+
+def test_get_name_pool_writes_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("EMPLOYEE_APP_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(names, "_pools", {})
+    get_name_pool("en_PH")
+    assert len(list(tmp_path.glob("names-en_PH-faker*.npz"))) == 1
+
+def test_sampled_names_follow_faker_formats():
+    pool = get_name_pool("en_PH")
+    sample = pool.sample(np.random.default_rng(2), 20000)
+    # Faker's en_PH formats put a prefix on 2% of names and a suffix on 2.5%
+    prefixed = np.mean([name.split()[0] in {"Mr.", "Dr.", "Mrs.", "Ms.", "Miss"} for name in sample])
+    assert 0.01 < prefixed < 0.03
+    assert all(len(name.split()) >= 2 for name in sample)
@@ -0,0 +1,50 @@
+import sys
+import pytest
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import Qt
+from employee_app.generator import generate_employee_data
+from employee_app.preview import FETCH_ROWS, FrameTableModel
+
+def cell(model, row, column):
+    return model.data(model.index(row, column))
+
+def test_model_fetches_rows_lazily():
+    df = generate_employee_data(2_500, vectorized=True, seed=1)
+    model = FrameTableModel()
+    model.set_frame(df)
+
+    assert model.rowCount() == FETCH_ROWS and model.canFetchMore()
+    model.fetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 2_500 and not model.canFetchMore()
+    assert cell(model, 2_499, 1) == df["full_name"].iloc[2_499]
+    assert cell(model, 0, 4) == str(df["hire_date"].iloc[0].date())
+
+def test_sort_and_filter_use_index_permutations():
+    df = generate_employee_data(5_000, vectorized=True, seed=2)
+    model = FrameTableModel()
+    model.set_frame(df)
+
+    model.sort(3, Qt.DescendingOrder)
+    assert cell(model, 0, 3) == str(df["salary"].max())
+    model.sort(2)
+    assert cell(model, 0, 2) == min(df["department"].astype(str))
+
+    model.set_filter("FINANCE")
+    expected = df[df["department"] == "Finance"]
+    assert model.visible_rows() == len(expected)
+    assert {cell(model, row, 2) for row in range(model.rowCount())} == {"Finance"}
+
+    model.sort(1)
+    names = [cell(model, row, 1) for row in range(model.rowCount())]
+    assert names == sorted(expected["full_name"])[:model.rowCount()]
+
+    model.set_filter("")
+    assert model.visible_rows() == len(df)
+    assert model.frame is df
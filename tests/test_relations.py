@@ -0,0 +1,57 @@
+import sys
+import tempfile
+import pandas as pd
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from employee_app.exporter import export_tables
+from employee_app.relations import TABLES, FanOut, iter_related_tables
+
+def load_tables(n, **kwargs):
+    return {name: pd.concat(chunks, ignore_index=True) for name, chunks in iter_related_tables(n, **kwargs).items()}
+
+def test_related_tables_keep_referential_integrity():
+    fanout = FanOut(salary_history=4, attendance_days=3, reports=5)
+    tables = load_tables(25_000, seed=8, chunk_size=7_000, fanout=fanout)
+    employees = tables["employees"].set_index("emp_id")
+
+    history = tables["salary_history"]
+    assert len(history) == 4 * len(employees) and history["record_id"].is_unique
+    assert history["emp_id"].isin(employees.index).all()
+    latest = history.groupby("emp_id").last()
+    assert latest["salary"].equals(employees["salary"].rename("salary"))
+    assert history.groupby("emp_id")["effective_date"].first().equals(employees["hire_date"].rename("effective_date"))
+    assert history.groupby("emp_id")["salary"].is_monotonic_increasing.all()
+
+    managers = tables["managers"]
+    assert managers["manager_id"].isna().sum() == 1
+    assert (managers["manager_id"].dropna() < managers["emp_id"][managers["manager_id"].notna()]).all()
+    assert managers.groupby("manager_id").size().max() == 5
+
+    attendance = tables["attendance"]
+    assert attendance["attendance_id"].is_unique and attendance.groupby("emp_id").size().max() == 3
+    hired = employees.loc[attendance["emp_id"], "hire_date"].to_numpy()
+    assert (attendance["work_date"].to_numpy() >= hired).all()
+
+    heads = tables["departments"].dropna().set_index("department")["head_id"]
+    assert all(employees.loc[head, "department"] == department for department, head in heads.items())
+
+def test_related_tables_do_not_depend_on_chunking():
+    one = load_tables(12_000, seed=3, chunk_size=12_000)
+    many = load_tables(12_000, seed=3, chunk_size=2_500)
+    for name in TABLES:
+        assert one[name].equals(many[name]), name
+
+def test_export_tables_writes_a_file_or_sheet_per_table():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = export_tables(iter_related_tables(30, seed=5), tmpdir, "csv")
+        assert [path.name for path in paths.values()] == [f"{name}.csv" for name in TABLES]
+        assert len(pd.read_csv(paths["salary_history"])) == 90
+        assert not (Path(tmpdir) / "salary_history_summary.csv").exists()
+
+        file_path = export_tables(iter_related_tables(30, seed=5), tmpdir, "xlsx")["employees"]
+        sheets = pd.read_excel(file_path, sheet_name=None)
+        assert list(sheets) == ["Departments", "Employees", "Managers", "Salary History", "Attendance", "Summary"]
+        assert sheets["Managers"]["manager_id"].isna().sum() == 1
@@ -0,0 +1,82 @@
+import json
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from employee_app.exporter import export_data
+from employee_app.generator import employee_dtypes, generate_employee_data, iter_employee_chunks
+from employee_app.schema import Schema, compile_schema, default_schema, load_schema
+
+BANDED = {
+    "name": "banded",
+    "columns": [
+        {"name": "emp_id", "type": "sequence"},
+        {"name": "department", "type": "category", "values": ["IT", "HR"], "weights": [3, 1]},
+        {"name": "salary", "type": "integer", "min": 20000, "max": 200000,
+         "by": "department", "bands": {"IT": [90000, 150000], "HR": [30000, 50000]}},
+        {"name": "bonus", "type": "float", "min": 0, "max": 1, "distribution": "normal", "mean": 0.1, "std": 0.05},
+        {"name": "hire_date", "type": "date", "start": "2015-01-01", "end": "2015-12-31"},
+    ],
+}
+
+def test_default_schema_matches_generator():
+    df = generate_employee_data(100, vectorized=True, seed=1)
+    assert list(df.columns) == [column.name for column in default_schema().columns]
+    assert dict(df.dtypes) == compile_schema().dtypes() == employee_dtypes()
+
+def test_banded_schema_respects_bands():
+    schema = Schema.from_dict(BANDED)
+    df = pd.concat(iter_employee_chunks(20_000, chunk_size=7_000, seed=3, schema=schema), ignore_index=True)
+
+    assert df["emp_id"].tolist() == list(range(1, 20_001))
+    bands = df.groupby("department", observed=True)["salary"].agg(["min", "max"])
+    assert bands.loc["IT", "min"] >= 90000 and bands.loc["IT", "max"] <= 150000
+    assert bands.loc["HR", "min"] >= 30000 and bands.loc["HR", "max"] <= 50000
+    assert 0.7 < (df["department"] == "IT").mean() < 0.8
+    assert df["bonus"].between(0, 1).all()
+    assert df["hire_date"].dt.year.eq(2015).all()
+    assert df.equals(generate_employee_data(20_000, vectorized=True, seed=3, schema=schema))
+
+def test_load_schema_from_json_and_export():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "schema.json"
+        path.write_text(json.dumps(BANDED))
+        schema = load_schema(path)
+        assert schema.fingerprint() == Schema.from_dict(BANDED).fingerprint()
+
+        file_path = export_data(iter_employee_chunks(500, seed=4, schema=schema), tmpdir, "csv")
+        assert list(pd.read_csv(file_path).columns) == ["emp_id", "department", "salary", "bonus", "hire_date"]
+
+@pytest.mark.parametrize("change, message", [
+    ({"type": "uuid"}, "unknown type"),
+    ({"min": 10, "max": 5}, "min <= max"),
+    ({"by": "hire_date"}, "earlier category column"),
+    ({"colour": "red"}, "unknown keys"),
+    ({"bands": {"IT": [150000, 90000]}}, "low <= high"),
+    ({"bands": {"HR": [30000]}}, r"\[low, high\]"),
+    ({"distribution": "normal", "mean": 100000}, "cannot be combined with bands"),
+])
+def test_invalid_schema_is_rejected(change, message):
+    spec = json.loads(json.dumps(BANDED))
+    spec["columns"][2].update(change)
+    with pytest.raises(ValueError, match=message):
+        Schema.from_dict(spec)
+
+def test_negative_weights_are_rejected():
+    spec = json.loads(json.dumps(BANDED))
+    spec["columns"][1]["weights"] = [2, -1]
+    with pytest.raises(ValueError, match="at least 0"):
+        Schema.from_dict(spec)
+
+def test_sequence_widens_past_int32():
+    plan = compile_schema()
+    emp_ids = plan.columns(np.random.default_rng(0), 3, 2**31 - 2)["emp_id"]
+    assert emp_ids.dtype == np.int64
+    assert emp_ids.tolist() == [2**31 - 2, 2**31 - 1, 2**31]
+    assert plan.columns(np.random.default_rng(0), 2, 2**31 - 3)["emp_id"].dtype == np.int32
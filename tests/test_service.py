@@ -0,0 +1,69 @@
+import io
+import json
+import socket
+import sys
+import time
+import urllib.error
+import urllib.request
+import pandas as pd
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from employee_app.generator import generate_employee_data
+from employee_app.service import EmployeeService, is_loopback, running_service
+
+def fetch(service, path):
+    with urllib.request.urlopen(service.url + path) as response:
+        return response.headers, response.read()
+
+def test_service_streams_each_format():
+    pa = pytest.importorskip("pyarrow")
+    df = generate_employee_data(2_500, vectorized=True, seed=3)
+    with running_service(port=0, workers=2) as service:
+        headers, body = fetch(service, "/employees?count=2500&seed=3&chunk_size=1000")
+        assert headers["Transfer-Encoding"] == "chunked" and headers["X-Seed"] == "3"
+        assert pd.read_json(io.BytesIO(body), lines=True)["full_name"].tolist() == df["full_name"].tolist()
+
+        _, body = fetch(service, "/employees?count=2500&seed=3&format=csv&chunk_size=1000")
+        assert pd.read_csv(io.BytesIO(body))["emp_id"].tolist() == df["emp_id"].tolist()
+
+        _, body = fetch(service, "/employees?count=500&seed=3&format=arrow&chunk_size=200&start_id=2001")
+        streamed = pa.ipc.open_stream(body).read_pandas()
+        assert streamed["full_name"].tolist() == df["full_name"].iloc[2_000:].tolist()
+
+def test_service_handles_concurrent_requests_and_reports_metrics():
+    with running_service(port=0, workers=2) as service:
+        with ThreadPoolExecutor(6) as pool:
+            bodies = list(pool.map(lambda seed: fetch(service, f"/employees?count=3000&seed={seed}&format=csv")[1],
+                                   range(6)))
+        assert [body.count(b"\n") for body in bodies] == [3_001] * 6
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            fetch(service, "/employees?count=0")
+        assert error.value.code == 400
+        with pytest.raises(urllib.error.HTTPError) as error:  # past the int32 emp_id range
+            fetch(service, f"/employees?count=2&start_id={2**31 - 1}")
+        assert error.value.code == 400
+        _, body = fetch(service, "/metrics")
+        metrics = json.loads(body)
+        assert metrics["requests"] == {"total": 6, "completed": 6, "rejected": 2}
+        assert metrics["rows"] == 18_000 and metrics["rows_per_s"] > 0
+        assert metrics["stages"]["serve.generate"]["rows"] == 18_000
+
+def test_slow_reader_holds_back_generation():
+    with running_service(port=0, workers=2) as service:
+        with socket.create_connection(("127.0.0.1", service.port)) as client:
+            client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 64 * 1024)
+            client.sendall(b"GET /employees?count=2000000&seed=1&chunk_size=10000 HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            time.sleep(0.5)  # read nothing
+            generated = service.metrics.stages["serve.generate"].rows
+            assert 0 < generated < 500_000
+
+def test_service_only_binds_localhost():
+    with pytest.raises(ValueError, match="localhost"):
+        EmployeeService(host="0.0.0.0")
+    assert is_loopback("127.0.0.1") and is_loopback("::1") and is_loopback("localhost")
@@ -0,0 +1,68 @@
+import json
+import sys
+import tempfile
+import pandas as pd
+import pytest
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from employee_app.generator import generate_employee_data
+from employee_app.shards import append_sharded, export_sharded, shard_ranges, verify_manifest
+
+def test_shard_ranges_are_contiguous_and_block_aligned():
+    ranges = shard_ranges(45_001, 4)
+    assert ranges[0][0] == 1 and ranges[-1][1] == 45_002
+    assert all(stop == start for (_, stop), (start, _) in zip(ranges, ranges[1:]))
+    assert all((start - 1) % 10_000 == 0 for start, _ in ranges)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sharded_export_matches_single_stream(workers):
+    df = generate_employee_data(25_000, vectorized=True, seed=6)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest_path = export_sharded(25_000, tmpdir, "parquet", shards=3, workers=workers, seed=6, chunk_size=4_000)
+        manifest = json.loads(manifest_path.read_text())
+        assert [shard["rows"] for shard in manifest["shards"]] == [10_000, 10_000, 5_000]
+        assert not list(manifest_path.parent.glob(".*"))  # no temp files left behind
+
+        parts = [pd.read_parquet(manifest_path.parent / shard["file"]) for shard in manifest["shards"]]
+        assert pd.concat(parts, ignore_index=True).astype(df.dtypes.to_dict()).equals(df)
+        summary = {row["Department"]: row["Employees"] for row in manifest["summary"]}
+        assert summary == df["department"].astype(str).value_counts().to_dict()
+        assert verify_manifest(manifest_path) == []
+
+def test_sharded_runs_get_their_own_directories():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first = export_sharded(100, tmpdir, "csv", workers=1, seed=1)
+        second = export_sharded(100, tmpdir, "csv", workers=1, seed=1)
+        assert first.parent != second.parent
+
+        (second.parent / "part-00001.csv").write_text("tampered")
+        assert verify_manifest(second) == ["part-00001.csv"]
+        assert verify_manifest(first) == []
+
+def test_append_sharded_adds_parts_and_extends_summary():
+    df = generate_employee_data(16_000, vectorized=True, seed=8)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest_path = export_sharded(12_000, tmpdir, "parquet", shards=2, workers=1, seed=8)
+        assert append_sharded(manifest_path.parent, 4_000, shards=2, workers=1) == manifest_path
+        manifest = json.loads(manifest_path.read_text())
+        assert manifest["rows"] == 16_000
+        # Shards are block-aligned, so 4,000 new rows fit in one new part
+        assert [(shard["file"], shard["start_id"]) for shard in manifest["shards"][2:]] == [("part-00003.parquet", 12_001)]
+        assert verify_manifest(manifest_path) == []
+        parts = [pd.read_parquet(manifest_path.parent / shard["file"]) for shard in manifest["shards"]]
+        loaded = pd.concat(parts, ignore_index=True).astype(df.dtypes.to_dict())
+        pd.testing.assert_frame_equal(loaded, df)
+        assert sum(row["Employees"] for row in manifest["summary"]) == 16_000
+
+def test_parquet_run_directory_reads_as_a_dataset():
+    pytest.importorskip("pyarrow")
+    df = generate_employee_data(15_000, vectorized=True, seed=9)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest_path = export_sharded(15_000, tmpdir, "parquet", shards=2, workers=1, seed=9)
+        assert manifest_path.name == "_manifest.json"
+        loaded = pd.read_parquet(manifest_path.parent).sort_values("emp_id", ignore_index=True)
+        pd.testing.assert_frame_equal(loaded.astype(df.dtypes.to_dict()), df)
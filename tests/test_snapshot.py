@@ -0,0 +1,53 @@
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from employee_app.exporter import export_data
+from employee_app.generator import generate_employee_data, iter_employee_chunks
+from employee_app.relations import generate_table_range
+from employee_app.snapshot import Snapshot, read_snapshot, write_snapshot
+from employee_app.summary import SummaryAccumulator
+
+def test_snapshot_round_trips_streamed_chunks_without_copying():
+    df = generate_employee_data(3_000, vectorized=True, seed=4)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = export_data(iter_employee_chunks(3_000, chunk_size=700, seed=4), tmpdir, "snapshot")
+        assert file_path.name == "employees.snapshot"
+        snapshot = Snapshot(file_path)
+        loaded = snapshot.to_frame()
+        pd.testing.assert_frame_equal(loaded, df)
+        assert np.shares_memory(loaded["salary"].to_numpy(), snapshot._map)
+        assert np.shares_memory(loaded["department"].cat.codes.to_numpy(), snapshot._map)
+
+        summary = SummaryAccumulator()
+        for chunk in snapshot.iter_chunks(chunk_size=700):  # same chunks as the export
+            summary.update(chunk)
+        assert snapshot.index["summary"] == summary.to_frame().to_dict(orient="records")
+        del loaded, snapshot
+
+def test_snapshot_keeps_missing_values():
+    managers = generate_table_range(1, 300, "managers", 2)
+    frame = pd.DataFrame({"name": pd.array(["a", None, "ccc"], dtype="string[pyarrow]"),
+                          "score": pd.array([1.5, None, 2.0], dtype="Float64")})
+    with tempfile.TemporaryDirectory() as tmpdir:
+        write_snapshot(managers, Path(tmpdir) / "managers.snapshot", metadata={"table": "managers"})
+        loaded = read_snapshot(Path(tmpdir) / "managers.snapshot")
+        pd.testing.assert_frame_equal(loaded, managers)
+        assert Snapshot(Path(tmpdir) / "managers.snapshot").metadata == {"table": "managers"}
+
+        write_snapshot(frame, Path(tmpdir) / "nulls.snapshot")
+        pd.testing.assert_frame_equal(read_snapshot(Path(tmpdir) / "nulls.snapshot"), frame)
+        del loaded
+
+def test_snapshot_rejects_other_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "employees.csv"
+        path.write_text("emp_id\n1\n" * 10)
+        with pytest.raises(ValueError, match="not an employee snapshot"):
+            Snapshot(path)
@@ -0,0 +1,61 @@
+import json
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from employee_app.generator import generate_employee_data, iter_employee_chunks
+from employee_app.summary import QuantileSketch, SummaryAccumulator
+
+def test_streaming_summary_matches_full_frame():
+    df = generate_employee_data(50_000, vectorized=True, seed=9)
+    summary = SummaryAccumulator()
+    for chunk in iter_employee_chunks(50_000, chunk_size=7_000, seed=9):
+        summary.update(chunk)
+
+    frame = summary.to_frame().set_index("Department")
+    expected = df.groupby("department", observed=True)["salary"].agg(["count", "sum", "min", "max", "mean", "std"])
+    expected.index = expected.index.astype(str)
+    expected = expected.sort_index()
+    assert frame["Employees"].to_dict() == expected["count"].to_dict()
+    assert frame["Total Salary"].to_dict() == expected["sum"].to_dict()
+    assert frame["Min Salary"].to_dict() == expected["min"].to_dict()
+    assert frame["Max Salary"].to_dict() == expected["max"].to_dict()
+    assert np.allclose(frame["Average Salary"], expected["mean"])
+    assert np.allclose(frame["Salary Std Dev"], expected["std"])
+
+    # Sketch percentiles land within 1% (in rank) of the exact ones
+    for department, salaries in df.groupby("department", observed=True)["salary"]:
+        rank = (salaries <= frame.loc[str(department), "P50 Salary"]).mean()
+        assert abs(rank - 0.5) < 0.01
+
+    years = summary.hire_year_frame().set_index("Hire Year")["Total"]
+    assert years.to_dict() == df["hire_date"].dt.year.value_counts().sort_index().to_dict()
+
+def test_quantile_sketch_merge_keeps_total_weight():
+    values = np.random.default_rng(0).normal(size=100_000)
+    left, right = QuantileSketch(k=256), QuantileSketch(k=256)
+    left.update(values[:60_000])
+    right.update(values[60_000:])
+    left.merge(right)
+
+    weight = sum(len(level) * 2 ** h for h, level in enumerate(left.levels))
+    assert left.count == weight == 100_000
+    assert abs(left.quantiles([0.5])[0] - np.median(values)) < 0.05
+
+def test_summary_state_round_trips_through_json():
+    chunks = list(iter_employee_chunks(12_000, chunk_size=3_000, seed=9))
+    uninterrupted, resumed = SummaryAccumulator(), SummaryAccumulator()
+    for chunk in chunks[:2]:
+        uninterrupted.update(chunk)
+        resumed.update(chunk)
+    resumed = SummaryAccumulator.from_state(json.loads(json.dumps(resumed.to_state())))
+    for chunk in chunks[2:]:
+        uninterrupted.update(chunk)
+        resumed.update(chunk)
+
+    pd.testing.assert_frame_equal(resumed.to_frame(), uninterrupted.to_frame())
+    pd.testing.assert_frame_equal(resumed.hire_year_frame(), uninterrupted.hire_year_frame())